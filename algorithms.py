@@ -1,91 +1,166 @@
 # algorithms.py
 
-import heapq
+from array import array
 from collections import deque
 import time
-from fpdf import FPDF
-import os
+import tracemalloc
+import heapq
+from itertools import count
+from grid import SolverState
+from frontier import make_frontier
+from reporting import PDFReportBackend, make_run_record
+from recording import Recording
+from constants import MAX_TRACE_STEPS, MAX_EPOCH, SMA_NODE_BUDGET, IDA_TABLE_SIZE, ARA_EPSILON, ARA_EPSILON_STEP
 
 class AlgorithmBase:
-    def __init__(self, grid):
+    def __init__(self, grid, record=True):
         self.grid = grid
         self.steps = []
+        self.step_count = 0
         self.start_time = None
         self.end_time = None
+        self.elapsed = 0.0  # Seconds spent in start() and run_step(), excluding pauses
         self.nodes_explored = 0
         self.path_length = 0
         self.found = False
+        self.path = []
+        self.goal = -1
+        self.peak_memory = None  # Bytes allocated at peak, when measured
+        # Replay recording and per-cell visualization flags, both skipped when
+        # record=False so bounded-memory solvers stay independent of grid size
+        self.record_events = record
+        self.recording = Recording(grid.rows, grid.cols) if record else None
+        self.state = SolverState(grid.rows, grid.cols) if record else None
+        
+        # Flat per-cell buffers, valid only where the stamp equals the current epoch
+        self.epoch = 0
+        self.parent = array('i')
+        self.g_score = array('i')
+        self.seen = array('I')
+        self.closed = array('I')
     
     def add_step(self, description, node=None):
-        """Record a step for PDF report"""
+        """Record a step for PDF report; node is a flat cell index"""
+        self.step_count += 1
+        if len(self.steps) >= MAX_TRACE_STEPS:
+            return
         step_info = {
             'description': description,
-            'node': node,
+            'node': divmod(node, self.grid.cols) if node is not None else None,
             'timestamp': time.time() - self.start_time if self.start_time else 0,
             'nodes_explored': self.nodes_explored
         }
         self.steps.append(step_info)
     
+    def reset_run(self, buffers=True):
+        """Clear per-run results and start a new epoch of the state buffers.
+        
+        Solvers that keep their own bounded bookkeeping pass buffers=False to
+        skip allocating the per-cell arrays.
+        """
+        self.found = False
+        self.path.clear()
+        self.steps.clear()
+        self.step_count = 0
+        if self.record_events:
+            self.recording.clear()
+            self.state.clear()
+        self.elapsed = 0.0
+        self.nodes_explored = 0
+        self.path_length = 0
+        if not buffers:
+            return
+        
+        size = self.grid.rows * self.grid.cols
+        if len(self.seen) != size or self.epoch >= MAX_EPOCH:
+            # Allocate once per grid size; afterwards a new epoch invalidates everything
+            self.parent = array('i', [-1]) * size
+            self.g_score = array('i', [0]) * size
+            self.seen = array('I', [0]) * size
+            self.closed = array('I', [0]) * size
+            self.epoch = 0
+        self.epoch += 1
+    
+    def reject_unreachable(self):
+        """Skip the search when start and goal lie in different regions of the grid"""
+        if self.grid.is_reachable(self.grid.start_pos, self.grid.goal_pos):
+            return False
+        self.add_step("Goal is unreachable from the start, search skipped")
+        return True
+    
+    def index(self, pos):
+        return pos[0] * self.grid.cols + pos[1]
+    
+    def heuristic(self, a, b):
+        """Manhattan distance heuristic"""
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+    
+    def estimate(self, index):
+        """Heuristic from a flat cell index to the goal"""
+        return self.heuristic(divmod(index, self.grid.cols), self.grid.goal_pos)
+    
+    def solve(self, measure_memory=False):
+        """Run the algorithm to completion at full speed; returns True if a path was found.
+        
+        With measure_memory the peak bytes traced during the run are stored in
+        peak_memory (tracing slows the run down). The peak starts from what is
+        already traced, so to include the solver's own buffers start
+        tracemalloc before constructing it.
+        """
+        started_tracing = measure_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if measure_memory:
+            tracemalloc.reset_peak()
+        try:
+            begin = time.perf_counter()
+            if not self.start():
+                return False
+            while not self.run_step():
+                pass
+            self.elapsed = time.perf_counter() - begin
+            self.end_time = time.time()
+            return self.found
+        finally:
+            if measure_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+    
+    def reconstruct_path(self):
+        """Reconstruct the path from goal to start"""
+        if not self.found:
+            return
+        
+        # Backtrack from goal to start
+        cols = self.grid.cols
+        start = self.index(self.grid.start_pos)
+        current = self.index(self.grid.goal_pos)
+        while current != start:
+            self.path.append(divmod(current, cols))
+            current = self.parent[current]
+        
+        self.path_length = len(self.path)
+        self.add_step(f"Path reconstructed with {self.path_length} steps")
+        
+        # Record path cells
+        for row, col in self.path:
+            index = row * cols + col
+            self.recording.path(index)
+            self.state.mark_path(index)
+    
     def generate_pdf_report(self, algorithm_name):
         """Generate PDF report with algorithm steps and results"""
-        if not os.path.exists('reports'):
-            os.makedirs('reports')
-        
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        filename = f"reports/{algorithm_name}_report_{timestamp}.pdf"
-        
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Title
-        pdf.set_font('Arial', 'B', 16)
-        pdf.cell(0, 10, f'{algorithm_name} Pathfinding Report', 0, 1, 'C')
-        pdf.ln(10)
-        
-        # Results summary
-        pdf.set_font('Arial', 'B', 12)
-        pdf.cell(0, 10, 'Results Summary:', 0, 1)
-        pdf.set_font('Arial', '', 12)
-        
-        result_text = "Path Found: Yes" if self.found else "Path Found: No"
-        pdf.cell(0, 10, result_text, 0, 1)
-        pdf.cell(0, 10, f"Total Time: {self.end_time - self.start_time:.4f} seconds", 0, 1)
-        pdf.cell(0, 10, f"Nodes Explored: {self.nodes_explored}", 0, 1)
-        pdf.cell(0, 10, f"Path Length: {self.path_length}", 0, 1)
-        pdf.ln(10)
-        
-        # Algorithm steps
-        pdf.set_font('Arial', 'B', 12)
-        pdf.cell(0, 10, 'Algorithm Steps:', 0, 1)
-        pdf.set_font('Arial', '', 10)
-        
-        for i, step in enumerate(self.steps[:50]):  # Limit to first 50 steps
-            node_str = f" at {step['node']}" if step['node'] else ""
-            pdf.cell(0, 8, f"Step {i+1}: {step['description']}{node_str} (Time: {step['timestamp']:.2f}s, Nodes: {step['nodes_explored']})", 0, 1)
-        
-        if len(self.steps) > 50:
-            pdf.cell(0, 8, f"... and {len(self.steps) - 50} more steps", 0, 1)
-        
-        pdf.ln(10)
-        
-        # Grid information
-        pdf.set_font('Arial', 'B', 12)
-        pdf.cell(0, 10, 'Grid Information:', 0, 1)
-        pdf.set_font('Arial', '', 12)
-        pdf.cell(0, 10, f"Grid Size: {self.grid.rows} x {self.grid.cols}", 0, 1)
-        pdf.cell(0, 10, f"Start Position: {self.grid.start_pos}", 0, 1)
-        pdf.cell(0, 10, f"Goal Position: {self.grid.goal_pos}", 0, 1)
-        
-        pdf.output(filename)
-        return filename
+        return PDFReportBackend().write_run_report(self, algorithm_name)
+    
+    def run_record(self, algorithm_name=None):
+        """Machine-readable summary of the last run"""
+        return make_run_record(self, algorithm_name)
 
 class BFS(AlgorithmBase):
     def __init__(self, grid):
         super().__init__(grid)
-        self.visited = set()
         self.queue = deque()
-        self.parent = {}
-        self.path = []
     
     def run_step(self):
         """Run one step of BFS algorithm"""
@@ -93,99 +168,76 @@ class BFS(AlgorithmBase):
             return True  # Algorithm finished
         
         # Get next cell from queue
-        row, col = self.queue.popleft()
-        cell = self.grid.cells[row][col]
+        current = self.queue.popleft()
+        epoch = self.epoch
         
         # Skip if already visited
-        if (row, col) in self.visited:
+        if self.closed[current] == epoch:
             return False
         
         # Mark as visited
-        self.visited.add((row, col))
-        cell.visited = True
-        cell.in_frontier = False
+        self.closed[current] = epoch
+        self.recording.expand(current)
+        self.state.mark_visited(current)
         self.nodes_explored += 1
         
-        self.add_step("Visited node", (row, col))
+        self.add_step("Visited node", current)
         
         # Check if we reached the goal
-        if (row, col) == self.grid.goal_pos:
+        if current == self.goal:
             self.found = True
-            self.add_step("Goal reached!", (row, col))
+            self.add_step("Goal reached!", current)
             self.reconstruct_path()
             return True
         
         # Explore neighbors
-        neighbors = self.grid.get_neighbors(row, col)
-        self.add_step(f"Exploring {len(neighbors)} neighbors", (row, col))
+        neighbors = self.grid.neighbor_indices(current)
+        self.add_step(f"Exploring {len(neighbors)} neighbors", current)
         
+        seen = self.seen
         for neighbor in neighbors:
-            if neighbor not in self.visited and neighbor not in self.parent:
+            if seen[neighbor] != epoch:
+                seen[neighbor] = epoch
                 self.queue.append(neighbor)
-                self.parent[neighbor] = (row, col)
-                n_row, n_col = neighbor
-                self.grid.cells[n_row][n_col].in_frontier = True
+                self.parent[neighbor] = current
+                self.recording.push(neighbor)
+                self.state.mark_frontier(neighbor)
         
         return False
     
-    def reconstruct_path(self):
-        """Reconstruct the path from goal to start"""
-        if not self.found:
-            return
-        
-        # Backtrack from goal to start
-        current = self.grid.goal_pos
-        path_steps = []
-        while current != self.grid.start_pos:
-            self.path.append(current)
-            path_steps.append(current)
-            current = self.parent[current]
-        
-        self.path_length = len(self.path)
-        self.add_step(f"Path reconstructed with {self.path_length} steps")
-        
-        # Mark path cells
-        for row, col in self.path:
-            self.grid.cells[row][col].in_path = True
-    
     def start(self):
         """Initialize and start BFS algorithm"""
         if not self.grid.start_pos or not self.grid.goal_pos:
             return False
         
-        self.visited.clear()
         self.queue.clear()
-        self.parent.clear()
-        self.found = False
-        self.path.clear()
-        self.steps.clear()
-        self.nodes_explored = 0
-        self.path_length = 0
+        self.reset_run()
+        self.goal = self.index(self.grid.goal_pos)
         
         self.start_time = time.time()
         self.add_step("BFS algorithm started")
         self.add_step(f"Start position: {self.grid.start_pos}")
         self.add_step(f"Goal position: {self.grid.goal_pos}")
         
+        if self.reject_unreachable():
+            return True
+        
         # Start from the start position
-        self.queue.append(self.grid.start_pos)
-        self.parent[self.grid.start_pos] = None
+        start = self.index(self.grid.start_pos)
+        self.queue.append(start)
+        self.seen[start] = self.epoch
+        self.parent[start] = -1
+        self.recording.push(start)
+        self.state.mark_frontier(start)
         
         return True
 
 class AStar(AlgorithmBase):
-    def __init__(self, grid):
-        super().__init__(grid)
-        self.open_set = []
-        self.closed_set = set()
-        self.g_score = {}
-        self.f_score = {}
-        self.parent = {}
-        self.path = []
+    display_name = "A*"
     
-    def heuristic(self, a, b):
-        """Manhattan distance heuristic"""
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+    def __init__(self, grid, frontier="heap", record=True):
+        super().__init__(grid, record)
+        self.open_set = make_frontier(frontier)
     
     def run_step(self):
         """Run one step of A* algorithm"""
@@ -193,102 +245,795 @@ class AStar(AlgorithmBase):
             return True  # Algorithm finished
         
         # Get cell with lowest f_score
-        _, current = heapq.heappop(self.open_set)
-        row, col = current
-        cell = self.grid.cells[row][col]
+        _, current = self.open_set.pop()
+        epoch = self.epoch
         
         # Skip if already processed
-        if current in self.closed_set:
+        if self.closed[current] == epoch:
             return False
         
         # Mark as visited
-        self.closed_set.add(current)
-        cell.visited = True
-        cell.in_frontier = False
+        self.closed[current] = epoch
+        self.recording.expand(current)
+        self.state.mark_visited(current)
         self.nodes_explored += 1
         
-        self.add_step("Visited node", (row, col))
+        self.add_step("Visited node", current)
         
         # Check if we reached the goal
-        if current == self.grid.goal_pos:
+        if current == self.goal:
             self.found = True
-            self.add_step("Goal reached!", (row, col))
+            self.add_step("Goal reached!", current)
             self.reconstruct_path()
             return True
         
         # Explore neighbors
-        neighbors = self.grid.get_neighbors(row, col)
-        self.add_step(f"Exploring {len(neighbors)} neighbors", (row, col))
+        neighbors = self.grid.neighbor_indices(current)
+        self.add_step(f"Exploring {len(neighbors)} neighbors", current)
         
+        seen = self.seen
+        g_score = self.g_score
+        tentative_g = g_score[current] + 1
         for neighbor in neighbors:
-            if neighbor in self.closed_set:
+            if self.closed[neighbor] == epoch:
                 continue
             
-            # Calculate tentative g_score
-            tentative_g = self.g_score[current] + 1
-            
-            if neighbor not in self.g_score or tentative_g < self.g_score[neighbor]:
+            if seen[neighbor] != epoch or tentative_g < g_score[neighbor]:
                 # This path to neighbor is better than any previous one
+                seen[neighbor] = epoch
                 self.parent[neighbor] = current
-                self.g_score[neighbor] = tentative_g
-                self.f_score[neighbor] = tentative_g + self.heuristic(neighbor, self.grid.goal_pos)
+                g_score[neighbor] = tentative_g
                 
-                # Add to open set if not already there
-                if not any(neighbor == item[1] for item in self.open_set):
-                    heapq.heappush(self.open_set, (self.f_score[neighbor], neighbor))
-                    n_row, n_col = neighbor
-                    self.grid.cells[n_row][n_col].in_frontier = True
-                    self.add_step("Added to frontier", neighbor)
+                # Push the improved entry; stale ones are skipped once closed
+                self.open_set.push(tentative_g + self.estimate(neighbor), neighbor)
+                self.recording.push(neighbor)
+                self.state.mark_frontier(neighbor)
+                self.add_step("Added to frontier", neighbor)
         
         return False
     
-    def reconstruct_path(self):
-        """Reconstruct the path from goal to start"""
-        if not self.found:
-            return
+    def start(self):
+        """Initialize and start A* algorithm"""
+        if not self.grid.start_pos or not self.grid.goal_pos:
+            return False
         
-        # Backtrack from goal to start
-        current = self.grid.goal_pos
-        path_steps = []
-        while current != self.grid.start_pos:
-            self.path.append(current)
-            path_steps.append(current)
+        self.open_set.clear()
+        self.reset_run()
+        self.goal = self.index(self.grid.goal_pos)
+        
+        self.start_time = time.time()
+        self.add_step(f"{self.display_name} algorithm started")
+        self.add_step(f"Start position: {self.grid.start_pos}")
+        self.add_step(f"Goal position: {self.grid.goal_pos}")
+        
+        if self.reject_unreachable():
+            return True
+        
+        # Initialize scores
+        start = self.index(self.grid.start_pos)
+        self.seen[start] = self.epoch
+        self.g_score[start] = 0
+        self.parent[start] = -1
+        start_f = self.estimate(start)
+        self.add_step(f"Initial heuristic score: {start_f}")
+        
+        # Start from the start position
+        self.open_set.push(start_f, start)
+        self.recording.push(start)
+        self.state.mark_frontier(start)
+        
+        return True
+
+class Dijkstra(AStar):
+    """Uniform-cost search: A* with a zero heuristic"""
+    display_name = "Dijkstra"
+    
+    def heuristic(self, a, b):
+        return 0
+
+class ARAStar(AStar):
+    """Anytime repairing A* (Likhachev et al., 2003).
+    
+    Starts with a weighted A* search whose path is at most epsilon times
+    optimal, then lowers epsilon and repairs the previous search instead of
+    starting over: only cells whose g improved after they were expanded are
+    re-opened. Stops at epsilon 1, or at the deadline (seconds from start)
+    with the best path found so far. Every solution is appended to
+    solutions and passed to on_solution.
+    """
+    display_name = "ARA*"
+    
+    def __init__(self, grid, epsilon=ARA_EPSILON, epsilon_step=ARA_EPSILON_STEP, deadline=None, on_solution=None):
+        # Weighted priorities are not integers, so only the heap frontier applies
+        super().__init__(grid, frontier="heap")
+        self.initial_epsilon = max(epsilon, 1.0)
+        self.epsilon_step = epsilon_step
+        self.deadline = deadline
+        self.on_solution = on_solution
+        self.epsilon = self.initial_epsilon
+        self.open_cells = set()
+        self.incons = set()  # Improved after expansion in the current search
+        self.search_pass = 0  # Stamp of the current search in the closed buffer
+        self.solutions = []
+        self.done = False
+    
+    def key(self, index):
+        return self.g_score[index] + self.epsilon * self.estimate(index)
+    
+    def open_cell(self, index):
+        self.open_cells.add(index)
+        self.open_set.push(self.key(index), index)
+        self.recording.push(index)
+        self.state.mark_frontier(index)
+    
+    def goal_cost(self):
+        """Cost of the best path to the goal found so far, or None"""
+        if self.seen[self.goal] != self.epoch:
+            return None
+        return self.g_score[self.goal]
+    
+    def run_step(self):
+        """Expand one cell of the current weighted search"""
+        if self.done:
+            return True
+        if self.deadline is not None and time.time() - self.start_time >= self.deadline:
+            self.add_step(f"Deadline of {self.deadline}s reached")
+            return self.finish()
+        
+        # Skip entries of cells that were expanded since they were pushed
+        while True:
+            if not self.open_set:
+                return self.end_search()
+            key, current = self.open_set.pop()
+            if current in self.open_cells:
+                break
+        
+        goal_cost = self.goal_cost()
+        if goal_cost is not None and key >= goal_cost:
+            # No open cell can lead to a path cheaper than the current one
+            return self.end_search()
+        
+        self.open_cells.discard(current)
+        self.closed[current] = self.search_pass
+        self.recording.expand(current)
+        self.state.mark_visited(current)
+        self.nodes_explored += 1
+        self.add_step("Visited node", current)
+        
+        epoch = self.epoch
+        seen = self.seen
+        g_score = self.g_score
+        tentative_g = g_score[current] + 1
+        for neighbor in self.grid.neighbor_indices(current):
+            if seen[neighbor] != epoch or tentative_g < g_score[neighbor]:
+                seen[neighbor] = epoch
+                self.parent[neighbor] = current
+                g_score[neighbor] = tentative_g
+                if self.closed[neighbor] == self.search_pass:
+                    # Already expanded in this search; reopened by the next one
+                    self.incons.add(neighbor)
+                else:
+                    self.open_cell(neighbor)
+        
+        return False
+    
+    def end_search(self):
+        """Publish the current search's path and start the next one with a lower epsilon"""
+        goal_cost = self.goal_cost()
+        if goal_cost is None:
+            self.add_step("No path found")
+            return self.finish()
+        
+        # Parents improved since the goal was reached can make the traced path shorter than g
+        path = self.trace_path()
+        
+        # The optimal cost is at least the lowest unweighted f of any open cell
+        candidates = self.open_cells | self.incons
+        lower = min((self.g_score[index] + self.estimate(index) for index in candidates), default=None)
+        bound = 1.0 if lower is None or lower >= len(path) else min(self.epsilon, len(path) / lower)
+        solution = {
+            'epsilon': self.epsilon,
+            'bound': bound,
+            'path_length': len(path),
+            'time': time.time() - self.start_time,
+            'nodes_explored': self.nodes_explored,
+            'path': path
+        }
+        self.solutions.append(solution)
+        self.found = True
+        self.add_step(f"Path of {len(path)} steps with epsilon {self.epsilon:g}, at most {bound:.3f}x optimal")
+        if self.on_solution:
+            self.on_solution(solution)
+        
+        if bound <= 1.0 or self.epsilon <= 1.0:
+            return self.finish()
+        
+        # Next search: lower epsilon, reopen inconsistent cells and re-key the open list
+        self.epsilon = max(1.0, self.epsilon - self.epsilon_step)
+        self.next_pass()
+        self.open_cells |= self.incons
+        self.incons.clear()
+        self.open_set.clear()
+        for index in self.open_cells:
+            self.open_set.push(self.key(index), index)
+        return False
+    
+    def next_pass(self):
+        self.search_pass += 1
+        if self.search_pass >= MAX_EPOCH:
+            self.closed = array('I', bytes(4 * len(self.closed)))
+            self.search_pass = 1
+    
+    def trace_path(self):
+        """Current path from goal back to start, excluding start, as (row, col)"""
+        cols = self.grid.cols
+        start = self.index(self.grid.start_pos)
+        path = []
+        current = self.goal
+        while current != start:
+            path.append(divmod(current, cols))
             current = self.parent[current]
+        return path
+    
+    def finish(self):
+        """Stop with the last published solution"""
+        self.done = True
+        if self.solutions:
+            best = self.solutions[-1]
+            self.path = list(best['path'])
+            self.path_length = best['path_length']
+            cols = self.grid.cols
+            for row, col in self.path:
+                self.recording.path(row * cols + col)
+                self.state.mark_path(row * cols + col)
+        return True
+    
+    def start(self):
+        """Initialize and start the first weighted search"""
+        if not self.grid.start_pos or not self.grid.goal_pos:
+            return False
+        
+        self.open_set.clear()
+        self.open_cells.clear()
+        self.incons.clear()
+        self.solutions = []
+        self.done = False
+        self.epsilon = self.initial_epsilon
+        self.reset_run()
+        self.next_pass()
+        self.goal = self.index(self.grid.goal_pos)
         
+        self.start_time = time.time()
+        self.add_step(f"ARA* algorithm started with epsilon {self.epsilon:g}")
+        self.add_step(f"Start position: {self.grid.start_pos}")
+        self.add_step(f"Goal position: {self.grid.goal_pos}")
+        
+        if self.reject_unreachable():
+            return True
+        
+        start = self.index(self.grid.start_pos)
+        self.seen[start] = self.epoch
+        self.g_score[start] = 0
+        self.parent[start] = -1
+        self.open_cell(start)
+        
+        return True
+
+class IDAStar(AlgorithmBase):
+    """Iterative-deepening A*: depth-first search under a growing f bound.
+    
+    Search memory is the current path plus an optional transposition table
+    that remembers the cheapest g seen per cell in this iteration, capped at
+    table_size entries; without the table it is O(path length), at the cost
+    of re-expanding cells reached by many equal paths. The replay recording
+    and visualization flags add 5 bytes per cell plus 4 bytes per expansion;
+    record=False drops both, so memory no longer depends on the grid size.
+    """
+    display_name = "IDA*"
+    
+    def __init__(self, grid, transposition_table=True, table_size=IDA_TABLE_SIZE, record=True):
+        super().__init__(grid, record)
+        self.use_table = transposition_table
+        self.table_size = table_size
+        self.table = {}
+        self.stack = []  # [cell, g, open neighbors, next neighbor position]
+        self.on_path = set()
+        self.bound = 0
+        self.next_bound = None
+        self.iterations = 0
+        self.peak_nodes = 0
+    
+    def expand(self, cell, g):
+        """Push a cell onto the search path and count its expansion"""
+        self.stack.append([cell, g, self.grid.neighbor_indices(cell), 0])
+        self.on_path.add(cell)
+        self.nodes_explored += 1
+        if self.record_events:
+            self.recording.expand(cell)
+            self.state.mark_visited(cell)
+        self.peak_nodes = max(self.peak_nodes, len(self.stack) + len(self.table))
+    
+    def run_step(self):
+        """Advance the depth-first search by one expansion or backtrack"""
+        if self.found:
+            return True
+        
+        if not self.stack:
+            # Start the next iteration with the smallest f that exceeded the bound
+            if self.next_bound is None:
+                return True  # Search space exhausted
+            self.bound = self.next_bound
+            self.next_bound = None
+            self.iterations += 1
+            self.table.clear()
+            self.add_step(f"Iteration {self.iterations} with f bound {self.bound}")
+            self.expand(self.start_cell, 0)
+            return False
+        
+        frame = self.stack[-1]
+        cell, g, neighbors, position = frame
+        if cell == self.goal:
+            self.found = True
+            self.add_step("Goal reached!", cell)
+            self.reconstruct_stack_path()
+            return True
+        
+        while position < len(neighbors):
+            neighbor = neighbors[position]
+            position += 1
+            if neighbor in self.on_path:
+                continue
+            
+            child_g = g + 1
+            f = child_g + self.estimate(neighbor)
+            if f > self.bound:
+                if self.next_bound is None or f < self.next_bound:
+                    self.next_bound = f
+                continue
+            
+            if self.use_table:
+                best = self.table.get(neighbor)
+                if best is not None and best <= child_g:
+                    continue
+                if best is not None or len(self.table) < self.table_size:
+                    self.table[neighbor] = child_g
+            
+            frame[3] = position
+            if self.record_events:
+                self.recording.push(neighbor)
+            self.expand(neighbor, child_g)
+            return False
+        
+        # All neighbors tried: backtrack
+        self.stack.pop()
+        self.on_path.discard(cell)
+        return False
+    
+    def reconstruct_stack_path(self):
+        cols = self.grid.cols
+        self.path = [divmod(frame[0], cols) for frame in reversed(self.stack[1:])]
         self.path_length = len(self.path)
         self.add_step(f"Path reconstructed with {self.path_length} steps")
+        for frame in self.stack[1:]:
+            if self.record_events:
+                self.recording.path(frame[0])
+                self.state.mark_path(frame[0])
+    
+    def start(self):
+        """Initialize and start IDA* algorithm"""
+        if not self.grid.start_pos or not self.grid.goal_pos:
+            return False
         
-        # Mark path cells
-        for row, col in self.path:
-            self.grid.cells[row][col].in_path = True
+        self.reset_run(buffers=False)
+        self.stack.clear()
+        self.on_path.clear()
+        self.table.clear()
+        self.iterations = 0
+        self.peak_nodes = 0
+        self.goal = self.index(self.grid.goal_pos)
+        self.start_cell = self.index(self.grid.start_pos)
+        
+        self.start_time = time.time()
+        self.add_step("IDA* algorithm started")
+        self.add_step(f"Start position: {self.grid.start_pos}")
+        self.add_step(f"Goal position: {self.grid.goal_pos}")
+        
+        if self.reject_unreachable():
+            self.next_bound = None
+            return True
+        
+        # The first iteration is bounded by the start's heuristic
+        self.next_bound = self.estimate(self.start_cell)
+        return True
+
+class SMANode:
+    __slots__ = ('cell', 'g', 'f', 'depth', 'parent', 'children', 'successors',
+                 'next_successor', 'forgotten', 'expanded', 'in_open', 'alive', 'version')
+    
+    def __init__(self, cell, g, f, depth, parent):
+        self.cell = cell
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.parent = parent
+        self.children = []
+        self.successors = None  # Neighbor cells, filled on first expansion
+        self.next_successor = 0
+        self.forgotten = []  # (f, cell, g) of pruned children to regenerate
+        self.expanded = False
+        self.in_open = False
+        self.alive = True
+        self.version = 0
+
+class SMAStar(AlgorithmBase):
+    """Simplified memory-bounded A* (Russell, 1992) with a node budget.
+    
+    Successors are generated one at a time. When the budget is full the
+    shallowest highest-f leaf is forgotten and its f is backed up into its
+    parent, which regenerates it if that branch becomes the best again.
+    Optimal whenever the optimal path fits in the budget. As with IDA*,
+    record=False drops the replay recording and the per-cell visualization
+    flags, leaving memory bounded by the node budget alone.
+    """
+    display_name = "SMA*"
+    
+    def __init__(self, grid, node_budget=SMA_NODE_BUDGET, record=True):
+        super().__init__(grid, record)
+        self.node_budget = max(node_budget, 2)
+        self.node_count = 0
+        self.peak_nodes = 0
+        self.best_heap = []  # (f, -depth, order, version, node)
+        self.worst_heap = []  # (-f, depth, order, version, node) for leaves
+        self.counter = count()
+        self.best_g = {}  # cell -> cheapest node in memory for that cell
+    
+    def touch(self, node):
+        """Re-index a node after its f, children or open state changed"""
+        node.version += 1
+        if node.in_open:
+            heapq.heappush(self.best_heap, (node.f, -node.depth, next(self.counter), node.version, node))
+        if not node.children:
+            heapq.heappush(self.worst_heap, (-node.f, node.depth, next(self.counter), node.version, node))
+        if len(self.best_heap) + len(self.worst_heap) > 4 * self.node_budget:
+            self.compact()
+    
+    def compact(self):
+        """Drop stale heap entries so the heaps stay proportional to the node budget"""
+        self.best_heap = [entry for entry in self.best_heap
+                          if entry[4].alive and entry[4].in_open and entry[3] == entry[4].version]
+        self.worst_heap = [entry for entry in self.worst_heap
+                           if entry[4].alive and not entry[4].children and entry[3] == entry[4].version]
+        heapq.heapify(self.best_heap)
+        heapq.heapify(self.worst_heap)
+    
+    def best(self):
+        """Lowest-f, deepest node in the open list"""
+        heap = self.best_heap
+        while heap:
+            node = heap[0][4]
+            if node.alive and node.in_open and heap[0][3] == node.version:
+                return node
+            heapq.heappop(heap)
+        return None
+    
+    def add_node(self, node):
+        self.node_count += 1
+        self.peak_nodes = max(self.peak_nodes, self.node_count)
+        current = self.best_g.get(node.cell)
+        if current is None or not current.alive or node.g < current.g:
+            self.best_g[node.cell] = node
+        node.in_open = True
+        self.touch(node)
+    
+    def remove_node(self, node):
+        node.alive = False
+        node.in_open = False
+        self.node_count -= 1
+        if self.best_g.get(node.cell) is node:
+            del self.best_g[node.cell]
+    
+    def has_more(self, node):
+        """Whether node still has successors that were never generated"""
+        return node.successors is None or node.next_successor < len(node.successors)
+    
+    def successor_f(self, node, cell):
+        return max(node.f, node.g + 1 + self.estimate(cell))
+    
+    def backup(self, node):
+        """Raise f to the lowest f among children, forgotten children and ungenerated successors.
+        
+        Ungenerated successors are sorted by f, so the next one bounds them
+        all. Backing up while successors remain keeps a node whose children
+        were forgotten from holding on to a stale f.
+        """
+        while node is not None and node.successors is not None:
+            bounds = [child.f for child in node.children] + [entry[0] for entry in node.forgotten]
+            if self.has_more(node):
+                bounds.append(self.successor_f(node, node.successors[node.next_successor]))
+            new_f = max(node.f, min(bounds, default=float('inf')))
+            if new_f == node.f:
+                break
+            node.f = new_f
+            self.touch(node)
+            node = node.parent
+    
+    def forget_worst(self, keep):
+        """Drop the shallowest highest-f leaf; returns False if no leaf may be dropped"""
+        heap = self.worst_heap
+        skipped = []
+        victim = None
+        while heap:
+            entry = heapq.heappop(heap)
+            node = entry[4]
+            if not node.alive or node.children or entry[3] != node.version:
+                continue
+            if node is keep or node.parent is None:
+                skipped.append(entry)
+                continue
+            victim = node
+            break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if victim is None:
+            return False
+        
+        parent = victim.parent
+        self.remove_node(victim)
+        parent.children.remove(victim)
+        if victim.f != float('inf'):
+            parent.forgotten.append((victim.f, victim.cell, victim.g))
+        parent.in_open = True
+        self.touch(parent)
+        return True
+    
+    def generate(self, node):
+        """Next successor of node: the lower-f of its best forgotten child and its next new successor"""
+        if node.successors is None:
+            ancestor = node.parent.cell if node.parent else -1
+            node.successors = sorted((n for n in self.grid.neighbor_indices(node.cell) if n != ancestor),
+                                     key=self.estimate)
+        while True:
+            fresh_f = None
+            if self.has_more(node):
+                fresh_f = self.successor_f(node, node.successors[node.next_successor])
+            node.forgotten.sort()
+            if node.forgotten and (fresh_f is None or node.forgotten[0][0] < fresh_f):
+                f, cell, g = node.forgotten.pop(0)
+            elif fresh_f is not None:
+                cell = node.successors[node.next_successor]
+                node.next_successor += 1
+                g = node.g + 1
+                f = fresh_f
+            else:
+                return None
+            
+            # Skip successors dominated by a cheaper copy already in memory
+            current = self.best_g.get(cell)
+            if current is not None and current.alive and current.g <= g:
+                continue
+            
+            depth = node.depth + 1
+            if cell != self.goal and depth >= self.node_budget - 1:
+                f = float('inf')  # The path to this node can never fit in memory
+            return SMANode(cell, g, f, depth, node)
+    
+    def run_step(self):
+        """Generate one successor of the best node"""
+        if self.found:
+            return True
+        
+        node = self.best()
+        if node is None or node.f == float('inf'):
+            return True  # No solution within the node budget
+        
+        if node.cell == self.goal:
+            self.found = True
+            self.add_step("Goal reached!", node.cell)
+            cols = self.grid.cols
+            while node.parent is not None:
+                self.path.append(divmod(node.cell, cols))
+                if self.record_events:
+                    self.recording.path(node.cell)
+                    self.state.mark_path(node.cell)
+                node = node.parent
+            self.path_length = len(self.path)
+            self.add_step(f"Path reconstructed with {self.path_length} steps")
+            return True
+        
+        if not node.expanded:
+            node.expanded = True
+            self.nodes_explored += 1
+            if self.record_events:
+                self.recording.expand(node.cell)
+                self.state.mark_visited(node.cell)
+            self.add_step("Visited node", node.cell)
+        
+        child = self.generate(node)
+        if child is None:
+            # Nothing left to generate
+            node.in_open = False
+            if not node.children and node.parent is not None:
+                # Dead end: drop it, its parent never needs to regenerate it
+                parent = node.parent
+                self.remove_node(node)
+                parent.children.remove(node)
+                self.touch(parent)
+                self.backup(parent)
+            else:
+                self.backup(node)
+            return False
+        
+        if self.node_count >= self.node_budget and not self.forget_worst(node):
+            # Memory holds only the path to node, so a path through the child
+            # can never fit; dropping it keeps node from regenerating it forever
+            self.backup(node)
+            return False
+        
+        node.children.append(child)
+        if not self.has_more(node) and not node.forgotten:
+            node.in_open = False
+        self.touch(node)
+        self.add_node(child)
+        if self.record_events:
+            self.recording.push(child.cell)
+            self.state.mark_frontier(child.cell)
+        self.backup(node)
+        return False
     
     def start(self):
-        """Initialize and start A* algorithm"""
+        """Initialize and start SMA* algorithm"""
         if not self.grid.start_pos or not self.grid.goal_pos:
             return False
         
-        self.open_set.clear()
-        self.closed_set.clear()
-        self.g_score.clear()
-        self.f_score.clear()
-        self.parent.clear()
-        self.found = False
-        self.path.clear()
-        self.steps.clear()
-        self.nodes_explored = 0
-        self.path_length = 0
+        self.reset_run(buffers=False)
+        self.best_heap.clear()
+        self.worst_heap.clear()
+        self.best_g.clear()
+        self.node_count = 0
+        self.peak_nodes = 0
+        self.goal = self.index(self.grid.goal_pos)
         
         self.start_time = time.time()
-        self.add_step("A* algorithm started")
+        self.add_step(f"SMA* algorithm started with a budget of {self.node_budget} nodes")
         self.add_step(f"Start position: {self.grid.start_pos}")
         self.add_step(f"Goal position: {self.grid.goal_pos}")
         
-        # Initialize scores
-        self.g_score[self.grid.start_pos] = 0
-        self.f_score[self.grid.start_pos] = self.heuristic(self.grid.start_pos, self.grid.goal_pos)
-        self.add_step(f"Initial heuristic score: {self.f_score[self.grid.start_pos]}")
+        if self.reject_unreachable():
+            return True
         
-        # Start from the start position
-        heapq.heappush(self.open_set, (self.f_score[self.grid.start_pos], self.grid.start_pos))
+        start = self.index(self.grid.start_pos)
+        self.add_node(SMANode(start, 0, self.estimate(start), 0, None))
+        return True
+
+class CHQuery(AlgorithmBase):
+    """Point-to-point queries on the grid's contraction hierarchy.
+    
+    The hierarchy is built on the first query and reused until the walls
+    change, so its preprocessing cost is paid once per layout. A query runs
+    two Dijkstra searches, from the start and from the goal, that only
+    follow edges to higher-ranked cells, then unpacks the shortcuts through
+    the best meeting cell back into grid moves.
+    """
+    display_name = "CH"
+    
+    def __init__(self, grid):
+        super().__init__(grid)
+        self.hierarchy = None
+        # Forward (from start) and backward (from goal) search
+        self.queues = ([], [])
+        self.distance = ({}, {})
+        self.parents = ({}, {})
+        self.best = None
+        self.meeting = -1
+        self.done = False
+    
+    def run_step(self):
+        """Settle one cell on the side with the smaller queue key"""
+        if self.done:
+            return True
+        
+        # A side stops once its smallest key cannot beat the best meeting
+        side = None
+        for candidate in (0, 1):
+            queue = self.queues[candidate]
+            if not queue or (self.best is not None and queue[0][0] >= self.best):
+                continue
+            if side is None or queue[0][0] < self.queues[side][0][0]:
+                side = candidate
+        if side is None:
+            self.finish()
+            return True
+        
+        cost, current = heapq.heappop(self.queues[side])
+        distance = self.distance[side]
+        if cost > distance[current]:
+            return False  # Stale entry
+        
+        self.recording.expand(current)
+        self.state.mark_visited(current)
+        self.nodes_explored += 1
+        self.add_step("Visited node", current)
+        
+        other = self.distance[1 - side].get(current)
+        if other is not None and (self.best is None or cost + other < self.best):
+            self.best = cost + other
+            self.meeting = current
+            self.add_step(f"Searches meet with path cost {self.best}", current)
+        
+        hierarchy = self.hierarchy
+        targets = hierarchy.targets
+        weights = hierarchy.weights
+        parents = self.parents[side]
+        for edge in range(hierarchy.first[current], hierarchy.first[current + 1]):
+            neighbor = targets[edge]
+            new_cost = cost + weights[edge]
+            if new_cost < distance.get(neighbor, new_cost + 1):
+                distance[neighbor] = new_cost
+                parents[neighbor] = current
+                heapq.heappush(self.queues[side], (new_cost, neighbor))
+                self.recording.push(neighbor)
+                self.state.mark_frontier(neighbor)
+        
+        return False
+    
+    def finish(self):
+        """Unpack the path through the meeting cell once both searches are done"""
+        self.done = True
+        if self.best is None:
+            self.add_step("No path found")
+            return
+        
+        # Hierarchy cells from the start up to the meeting cell and down to the goal
+        chain = [self.meeting]
+        while chain[0] in self.parents[0]:
+            chain.insert(0, self.parents[0][chain[0]])
+        while chain[-1] in self.parents[1]:
+            chain.append(self.parents[1][chain[-1]])
         
-        return True
\ No newline at end of file
+        cells = []
+        for a, b in zip(chain, chain[1:]):
+            cells.extend(self.hierarchy.unpack(a, b))
+        
+        self.found = True
+        self.add_step("Goal reached!", self.goal)
+        cols = self.grid.cols
+        self.path = [divmod(index, cols) for index in reversed(cells)]
+        self.path_length = len(self.path)
+        self.add_step(f"Path unpacked from {len(chain) - 1} hierarchy edges into {self.path_length} steps")
+        for index in reversed(cells):
+            self.recording.path(index)
+            self.state.mark_path(index)
+    
+    def start(self):
+        """Initialize a query, building the hierarchy first if the walls changed"""
+        if not self.grid.start_pos or not self.grid.goal_pos:
+            return False
+        
+        self.reset_run(buffers=False)
+        for side in (0, 1):
+            self.queues[side].clear()
+            self.distance[side].clear()
+            self.parents[side].clear()
+        self.best = None
+        self.meeting = -1
+        self.done = False
+        self.goal = self.index(self.grid.goal_pos)
+        
+        self.start_time = time.time()
+        self.add_step("CH query started")
+        self.add_step(f"Start position: {self.grid.start_pos}")
+        self.add_step(f"Goal position: {self.grid.goal_pos}")
+        
+        if self.reject_unreachable():
+            self.done = True
+            return True
+        
+        self.hierarchy = self.grid.contraction_hierarchy()
+        for side, pos in enumerate((self.grid.start_pos, self.grid.goal_pos)):
+            index = self.index(pos)
+            self.distance[side][index] = 0
+            heapq.heappush(self.queues[side], (0, index))
+            self.recording.push(index)
+            self.state.mark_frontier(index)
+        
+        return True
@@ -0,0 +1,159 @@
+# benchmark.py
+
+import argparse
+import random
+import time
+import tracemalloc
+from grid import Grid
+from algorithms import BFS, AStar, Dijkstra, ARAStar, IDAStar, SMAStar, CHQuery
+from multiagent import CooperativePlanner, random_agents, find_conflicts
+
+def prebuilt_ch(grid):
+    """CH query solver whose hierarchy is built up front, outside the timed runs"""
+    grid.contraction_hierarchy()
+    return CHQuery(grid)
+
+# Solver factories by name; "A*/bucket" uses the bucket-queue frontier,
+# "IDA*/notable" runs IDA* without its transposition table
+SOLVERS = {
+    "BFS": lambda grid: BFS(grid),
+    "A*/heap": lambda grid: AStar(grid, frontier="heap"),
+    "A*/bucket": lambda grid: AStar(grid, frontier="bucket"),
+    "Dijkstra/heap": lambda grid: Dijkstra(grid, frontier="heap"),
+    "Dijkstra/bucket": lambda grid: Dijkstra(grid, frontier="bucket"),
+    "ARA*": lambda grid: ARAStar(grid),
+    "IDA*": lambda grid: IDAStar(grid),
+    "IDA*/notable": lambda grid: IDAStar(grid, transposition_table=False),
+    "SMA*": lambda grid: SMAStar(grid),
+    "CH": prebuilt_ch
+}
+# Run only on request: IDA* without a table revisits cells exponentially
+# often on open grids, and building a hierarchy of a large open grid takes minutes
+OPT_IN_SOLVERS = ("IDA*/notable", "CH")
+
+def make_grid(size, wall_density=0.0, seed=0):
+    """Square grid with random walls, start and goal in opposite corners"""
+    grid = Grid(size, size)
+    rng = random.Random(seed)
+    for row in grid.cells:
+        for cell in row:
+            if rng.random() < wall_density:
+                cell.wall = True
+    grid.cells[0][0].wall = False
+    grid.cells[size - 1][size - 1].wall = False
+    grid.set_start(grid.cells[0][0])
+    grid.set_goal(grid.cells[size - 1][size - 1])
+    return grid
+
+def time_solver(factory, grid, repeat, measure_memory=False):
+    """Best-of-repeat solve time for one solver on one grid"""
+    best = None
+    solver = factory(grid)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solver.solve()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    if measure_memory:
+        # A separate traced run on a freshly built solver, so tracing overhead
+        # stays out of the timings and the per-cell buffers allocated at
+        # construction and on the first reset_run count towards the peak
+        tracemalloc.start()
+        try:
+            traced = factory(grid)
+            traced.solve(measure_memory=True)
+        finally:
+            tracemalloc.stop()
+        solver.peak_memory = traced.peak_memory
+    return solver, best
+
+def benchmark_agents(args):
+    """Planning throughput of the cooperative planner as the agent count grows"""
+    print(f"{'Size':>6}{'Agents':>8}{'Time s':>10}{'Agents/s':>10}{'Expanded':>10}{'Failed':>8}{'Makespan':>10}{'Conflicts':>10}")
+    for size in args.sizes:
+        grid = make_grid(size, args.walls, args.seed)
+        for count in args.agents:
+            agents = random_agents(grid, count, random.Random(args.seed))
+            planner = CooperativePlanner(grid, window=args.window)
+            paths = planner.plan(agents)
+            makespan = max((len(path) - 1 for path in paths if path), default=0)
+            rate = count / planner.planning_time if planner.planning_time else 0
+            print(f"{size:>6}{count:>8}{planner.planning_time:>10.4f}{rate:>10.1f}{planner.nodes_explored:>10}"
+                  f"{len(planner.failed):>8}{makespan:>10}{len(find_conflicts(paths, agents)):>10}")
+
+def check_memory_bounded(trials, seed, step_limit=200000):
+    """Regression check: SMA* must terminate with an optimal path under tight node budgets.
+    
+    Small random grids are solved with budgets just above the optimal path
+    length, where SMA* forgets and regenerates the most. Returns the failures.
+    """
+    rng = random.Random(seed)
+    failures = []
+    for trial in range(trials):
+        rows, cols = rng.choice([(7, 10), (10, 7), (8, 8), (12, 12)])
+        grid = Grid(rows, cols)
+        for index in range(rows * cols):
+            if rng.random() < 0.25:
+                grid.set_wall(index, True)
+        open_cells = [index for index, wall in enumerate(grid.walls) if not wall]
+        if len(open_cells) < 2:
+            continue
+        start, goal = rng.sample(open_cells, 2)
+        grid.start_pos = divmod(start, cols)
+        grid.goal_pos = divmod(goal, cols)
+        reference = BFS(grid)
+        reference.solve()
+        if not reference.found:
+            continue
+        
+        for budget in (reference.path_length + 2, reference.path_length + 5, 2 * reference.path_length + 4):
+            solver = SMAStar(grid, node_budget=budget, record=False)
+            solver.start()
+            steps = 0
+            while not solver.run_step() and steps < step_limit:
+                steps += 1
+            if steps >= step_limit:
+                failures.append((trial, budget, "did not terminate"))
+            elif not solver.found or solver.path_length != reference.path_length:
+                failures.append((trial, budget, f"path {solver.path_length if solver.found else '-'}, "
+                                                f"optimal {reference.path_length}"))
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pathfinding solvers on large grids")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400], help="grid side lengths")
+    parser.add_argument("--walls", type=float, default=0.0, help="random wall density (0 = open grid)")
+    parser.add_argument("--solvers", nargs="+", default=[name for name in SOLVERS if name not in OPT_IN_SOLVERS],
+                        choices=list(SOLVERS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per solver, best time is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--agents", type=int, nargs="+", help="benchmark multi-agent planning with these agent counts")
+    parser.add_argument("--window", type=int, default=None, help="WHCA* window for --agents (default: full cooperative A*)")
+    parser.add_argument("--memory", action="store_true", help="also report peak memory allocated per solve")
+    parser.add_argument("--check", type=int, metavar="TRIALS", help="run the SMA* tight-budget regression check instead")
+    args = parser.parse_args()
+    
+    if args.check:
+        failures = check_memory_bounded(args.check, args.seed)
+        for trial, budget, problem in failures:
+            print(f"SMA* trial {trial}, budget {budget}: {problem}")
+        print(f"SMA* check: {len(failures)} failures in {args.check} grids")
+        raise SystemExit(1 if failures else 0)
+    
+    if args.agents:
+        benchmark_agents(args)
+        return
+    
+    memory_header = f"{'Peak KB':>10}" if args.memory else ""
+    print(f"{'Size':>6} {'Solver':<16}{'Time s':>10}{'Expanded':>10}{'Exp/s':>12}{'Path':>7}{memory_header}")
+    for size in args.sizes:
+        grid = make_grid(size, args.walls, args.seed)
+        for name in args.solvers:
+            solver, elapsed = time_solver(SOLVERS[name], grid, args.repeat, args.memory)
+            rate = solver.nodes_explored / elapsed if elapsed else 0
+            path = solver.path_length if solver.found else "-"
+            memory = f"{solver.peak_memory / 1024:>10.1f}" if args.memory else ""
+            print(f"{size:>6} {name:<16}{elapsed:>10.4f}{solver.nodes_explored:>10}{rate:>12.0f}{path:>7}{memory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# connectivity.py
+
+import threading
+from array import array
+
+class ConnectivityIndex:
+    """Union-find labels of the connected open regions of a grid.
+    
+    Opening a cell is handled incrementally by union with its open
+    neighbors. Walling a cell can split a region, which union-find cannot
+    undo, so the index is rebuilt lazily on the next query unless the
+    cell had at most one open neighbor.
+    """
+    
+    def __init__(self, grid):
+        self.grid = grid
+        self.parent = array('i')
+        self.size = array('i')
+        self.dirty = True
+        self.retired = set()  # Walled cells still linked into the union-find trees
+        self.rebuilds = 0
+        self.lock = threading.Lock()
+    
+    def find(self, index):
+        parent = self.parent
+        while parent[index] != index:
+            # Path halving
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+    
+    def union(self, a, b):
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+    
+    def rebuild(self):
+        """Label every open cell from scratch"""
+        grid = self.grid
+        cells = grid.rows * grid.cols
+        self.parent = array('i', range(cells))
+        self.size = array('i', [1]) * cells
+        walls = grid.walls
+        cols = grid.cols
+        for index in range(cells):
+            if walls[index]:
+                continue
+            # Union with the right and lower neighbors covers every edge once
+            if (index + 1) % cols and not walls[index + 1]:
+                self.union(index, index + 1)
+            if index + cols < cells and not walls[index + cols]:
+                self.union(index, index + cols)
+        self.dirty = False
+        self.retired.clear()
+        self.rebuilds += 1
+    
+    def cell_opened(self, index):
+        """A wall was removed: join the cell with its open neighbors"""
+        if self.dirty:
+            return
+        if index in self.retired:
+            # Its old tree links may claim a connection that no longer exists
+            self.dirty = True
+            return
+        self.parent[index] = index
+        self.size[index] = 1
+        for neighbor in self.grid.neighbor_indices(index):
+            self.union(index, neighbor)
+    
+    def cell_closed(self, index):
+        """A wall was added: a cell with two or more open neighbors may split its region"""
+        if self.dirty:
+            return
+        # A dead end or isolated cell cannot disconnect anything. It stays in
+        # the union-find tree as an internal node; queries on walls are rejected.
+        if len(self.grid.neighbor_indices(index)) > 1:
+            self.dirty = True
+        else:
+            self.retired.add(index)
+    
+    def all_walls(self):
+        """Every cell became a wall; following openings rebuild regions incrementally"""
+        cells = self.grid.rows * self.grid.cols
+        self.parent = array('i', range(cells))
+        self.size = array('i', [1]) * cells
+        self.dirty = False
+        self.retired.clear()
+    
+    def invalidate(self):
+        self.dirty = True
+    
+    def connected(self, a, b):
+        """Whether open cells a and b (flat indices) are in the same region"""
+        walls = self.grid.walls
+        if walls[a] or walls[b]:
+            return False
+        with self.lock:
+            if self.dirty:
+                self.rebuild()
+            return self.find(a) == self.find(b)
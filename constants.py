@@ -23,6 +23,17 @@ BUTTON_COLOR = (70, 70, 80)
 BUTTON_HOVER = (90, 90, 100)
 BUTTON_ACTIVE = (110, 110, 120)
 
+# Solver state flags, one byte per cell
+STATE_VISITED = 1
+STATE_FRONTIER = 2
+STATE_PATH = 4
+
+# Visited, frontier, path and path highlight colors for each solver in a race
+SOLVER_PALETTES = [
+    (LIGHT_BLUE, ORANGE, GREEN, (150, 255, 150)),
+    (LIGHT_PURPLE, (255, 200, 120), PURPLE, (190, 120, 190))
+]
+
 # Grid settings
 CELL_SIZE = 25
 GRID_WIDTH = 40 
@@ -43,4 +54,34 @@ BUTTON_MARGIN = 10
 SECTION_MARGIN = 20
 
 # Message settings
-MESSAGE_DURATION = 3000  # 3 seconds
\ No newline at end of file
+MESSAGE_DURATION = 3000  # 3 seconds
+
+# Solver settings
+MAX_TRACE_STEPS = 50  # steps kept for the PDF report, the rest are only counted
+MAX_EPOCH = 2**32 - 1  # state buffers are reallocated when the epoch counter wraps
+SMA_NODE_BUDGET = 5000  # nodes SMA* may keep in memory
+IDA_TABLE_SIZE = 100000  # transposition table entries for IDA*
+ARA_EPSILON = 3.0  # heuristic weight of the first ARA* search
+ARA_EPSILON_STEP = 0.5  # weight decrease between ARA* searches
+CH_WITNESS_LIMIT = 200  # cells settled per witness search while building a contraction hierarchy
+
+# Playback settings
+PLAYBACK_SPEED = 2  # recorded events replayed per frame
+MAX_PLAYBACK_SPEED = 4096
+SNAPSHOT_INTERVAL = 1 / 30  # seconds between snapshots published by the search worker
+WORKER_BATCH = 64  # solver steps between pause/cancel checks
+
+# Offline rendering settings
+RENDER_CELL_SIZE = 4  # pixels per cell in exported images
+RENDER_FRAMES = 60  # frames of an exported exploration animation
+RENDER_FPS = 20
+
+# Multi-agent settings
+MULTI_AGENT_COUNT = 40
+MULTI_AGENT_WINDOW = None  # None plans full cooperative A*, an int runs windowed WHCA*
+AGENT_STEP_FRAMES = 8  # frames per agent move in the animation
+
+# Report settings
+REPORTS_DIR = "reports"
+RUN_LOG_PATH = "reports/runs.jsonl"  # use a .csv extension for CSV records
+PDF_REPORTS = False  # also write a PDF per run (requires fpdf)
\ No newline at end of file
@@ -0,0 +1,235 @@
+# dataset.py
+
+import argparse
+import json
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import product
+
+# Worker processes import pygame through grid; keep its banner out of the output
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from grid import Grid
+from algorithms import AStar
+
+DATASET_MAGIC = b"PFDS01"
+# seed, rows, cols, generator, found, start, goal, path length, nodes explored, solve microseconds
+RECORD_HEADER = struct.Struct("<IHHBBIIIII")
+GENERATOR_IDS = {"prim": 0, "random": 1}
+GENERATOR_NAMES = {value: name for name, value in GENERATOR_IDS.items()}
+
+# Path moves are 2-bit codes in Grid.neighbor_indices order
+MOVE_RIGHT, MOVE_DOWN, MOVE_LEFT, MOVE_UP = range(4)
+
+_TO_DIGITS = bytes.maketrans(b"\x00\x01\x02\x03", b"0123")
+_FROM_DIGITS = bytes.maketrans(b"0123", b"\x00\x01\x02\x03")
+
+def pack_digits(values, bits):
+    """Pack small ints (0/1 for bits=1, 0-3 for bits=2) least significant first"""
+    if not values:
+        return b""
+    digits = bytes(values).translate(_TO_DIGITS)[::-1]
+    size = (len(values) * bits + 7) // 8
+    return int(digits, 1 << bits).to_bytes(size, "little")
+
+def unpack_digits(data, count, bits):
+    """Inverse of pack_digits"""
+    if not count:
+        return bytearray()
+    binary = format(int.from_bytes(data, "little"), "b").zfill(count * bits)[::-1]
+    if bits == 1:
+        return bytearray(binary.encode().translate(_FROM_DIGITS))
+    return bytearray(int(binary[i]) | int(binary[i + 1]) << 1 for i in range(0, 2 * count, 2))
+
+def generate_prim(grid, rng, density):
+    grid.generate_maze_prim(rng)
+
+def generate_random(grid, rng, density):
+    grid.clear_grid()
+    for index in range(grid.rows * grid.cols):
+        if rng.random() < density:
+            grid.set_wall(index, True)
+
+GENERATORS = {
+    "prim": generate_prim,
+    "random": generate_random
+}
+
+def place_endpoints(grid, rng):
+    """Put start and goal on two distinct random open cells; False if there are not two"""
+    for pos in (grid.start_pos, grid.goal_pos):
+        if pos:
+            cell = grid.cells[pos[0]][pos[1]]
+            cell.start = cell.goal = False
+    grid.start_pos = grid.goal_pos = None
+    
+    open_cells = [index for index, wall in enumerate(grid.walls) if not wall]
+    if len(open_cells) < 2:
+        return False
+    start, goal = rng.sample(open_cells, 2)
+    grid.set_start(grid.cells[start // grid.cols][start % grid.cols])
+    grid.set_goal(grid.cells[goal // grid.cols][goal % grid.cols])
+    return True
+
+def encode_moves(grid, solver):
+    """2-bit move codes from start to goal along the solver's path"""
+    cols = grid.cols
+    cells = [grid.start_pos] + solver.path[::-1]
+    moves = []
+    for (row, col), (next_row, next_col) in zip(cells, cells[1:]):
+        delta = (next_row - row) * cols + (next_col - col)
+        moves.append(MOVE_RIGHT if delta == 1 else MOVE_DOWN if delta == cols else MOVE_LEFT if delta == -1 else MOVE_UP)
+    return moves
+
+def generate_batch(generator, size, seeds, density):
+    """Generate and solve one maze per seed; returns packed records"""
+    grid = Grid(size, size)
+    solver = AStar(grid, frontier="bucket")
+    records = []
+    for seed in seeds:
+        # String seeds hash the same in every process and Python run
+        rng = random.Random(f"{generator}-{size}-{seed}")
+        GENERATORS[generator](grid, rng, density)
+        if not place_endpoints(grid, rng):
+            continue
+        
+        begin = time.perf_counter()
+        solver.solve()
+        elapsed = int((time.perf_counter() - begin) * 1e6)
+        moves = encode_moves(grid, solver) if solver.found else []
+        
+        cols = grid.cols
+        header = RECORD_HEADER.pack(seed, grid.rows, cols, GENERATOR_IDS[generator], solver.found,
+                                    grid.start_pos[0] * cols + grid.start_pos[1],
+                                    grid.goal_pos[0] * cols + grid.goal_pos[1],
+                                    len(moves), solver.nodes_explored, elapsed)
+        records.append(header + pack_digits(grid.walls, 1) + pack_digits(moves, 2))
+    return records
+
+def read_shard(filename):
+    """Yield every record of a shard as a dict with walls (0/1 per cell) and moves"""
+    with open(filename, "rb") as f:
+        if f.read(len(DATASET_MAGIC)) != DATASET_MAGIC:
+            raise ValueError(f"{filename} is not a maze dataset shard")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if not header:
+                break
+            seed, rows, cols, generator, found, start, goal, length, nodes, elapsed = RECORD_HEADER.unpack(header)
+            cells = rows * cols
+            walls = unpack_digits(f.read((cells + 7) // 8), cells, 1)
+            moves = unpack_digits(f.read((length * 2 + 7) // 8), length, 2)
+            yield {
+                'seed': seed, 'rows': rows, 'cols': cols, 'generator': GENERATOR_NAMES[generator],
+                'found': bool(found), 'start': start, 'goal': goal, 'path_length': length,
+                'nodes_explored': nodes, 'solve_us': elapsed, 'walls': walls, 'moves': moves
+            }
+
+class ShardWriter:
+    """Appends packed records to numbered shard files of at most shard_size records"""
+    
+    def __init__(self, directory, shard_size):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.file = None
+        self.count = 0
+        self.shards = []  # [filename, records]
+        os.makedirs(directory, exist_ok=True)
+    
+    def write(self, record):
+        if self.file is None or self.count >= self.shard_size:
+            self.close()
+            filename = os.path.join(self.directory, f"shard_{len(self.shards):05d}.pfds")
+            self.file = open(filename, "wb")
+            self.file.write(DATASET_MAGIC)
+            self.shards.append([os.path.basename(filename), 0])
+            self.count = 0
+        self.file.write(record)
+        self.count += 1
+        self.shards[-1][1] += 1
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def parse_seeds(text):
+    """Seed range written as START:STOP, or a single seed"""
+    if ":" in text:
+        start, stop = text.split(":")
+        return range(int(start), int(stop))
+    return range(int(text), int(text) + 1)
+
+def batches(args):
+    """(generator, size, seeds) work units, produced lazily"""
+    for generator, size, seeds in product(args.generators, args.sizes, args.seeds):
+        for first in range(0, len(seeds), args.batch):
+            yield generator, size, list(seeds[first:first + args.batch]), args.density
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate mazes with their optimal paths into sharded dataset files")
+    parser.add_argument("--seeds", type=parse_seeds, nargs="+", default=[range(0, 100)], help="seed ranges as START:STOP")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[31], help="maze side lengths")
+    parser.add_argument("--generators", nargs="+", default=["prim"], choices=list(GENERATORS))
+    parser.add_argument("--density", type=float, default=0.3, help="wall density of the random generator")
+    parser.add_argument("--out", default="datasets/mazes", help="output directory")
+    parser.add_argument("--shard-size", type=int, default=10000, help="records per shard file")
+    parser.add_argument("--batch", type=int, default=64, help="mazes per work unit")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+    
+    writer = ShardWriter(args.out, args.shard_size)
+    totals = {}
+    begin = time.perf_counter()
+    work = batches(args)
+    
+    # Keep a bounded number of work units in flight and write results as they finish
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pending = set()
+        while True:
+            while len(pending) < 2 * args.workers:
+                unit = next(work, None)
+                if unit is None:
+                    break
+                pending.add(pool.submit(generate_batch, *unit))
+            if not pending:
+                break
+            
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    writer.write(record)
+                    seed, rows, cols, generator, found, _, _, length, nodes, _ = RECORD_HEADER.unpack_from(record)
+                    key = f"{GENERATOR_NAMES[generator]}/{rows}x{cols}"
+                    stats = totals.setdefault(key, {'mazes': 0, 'found': 0, 'path_length': 0, 'nodes_explored': 0})
+                    stats['mazes'] += 1
+                    stats['found'] += found
+                    stats['path_length'] += length
+                    stats['nodes_explored'] += nodes
+    writer.close()
+    
+    elapsed = time.perf_counter() - begin
+    for stats in totals.values():
+        stats['mean_path_length'] = stats.pop('path_length') / stats['found'] if stats['found'] else 0
+        stats['mean_nodes_explored'] = stats.pop('nodes_explored') / stats['mazes']
+    manifest = {
+        'format': DATASET_MAGIC.decode(),
+        'generators': args.generators,
+        'sizes': args.sizes,
+        'seeds': [[seeds.start, seeds.stop] for seeds in args.seeds],
+        'density': args.density,
+        'shards': [{'file': name, 'records': records} for name, records in writer.shards],
+        'stats': totals,
+        'seconds': round(elapsed, 3)
+    }
+    with open(os.path.join(args.out, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    
+    count = sum(records for _, records in writer.shards)
+    print(f"Wrote {count} mazes to {len(writer.shards)} shards in {args.out} ({elapsed:.2f}s, {count / elapsed:.0f} mazes/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# frontier.py
+
+import heapq
+from collections import deque
+from itertools import count
+
+class HeapFrontier:
+    """Binary-heap priority queue; ties pop in insertion order, or newest first with lifo"""
+    
+    def __init__(self, lifo=False):
+        self.heap = []
+        self.lifo = lifo
+        self.counter = count()
+    
+    def __len__(self):
+        return len(self.heap)
+    
+    def push(self, priority, item):
+        order = next(self.counter)
+        heapq.heappush(self.heap, (priority, -order if self.lifo else order, item))
+    
+    def pop(self):
+        """Remove and return (priority, item) with the lowest priority"""
+        priority, _, item = heapq.heappop(self.heap)
+        return priority, item
+    
+    def clear(self):
+        self.heap.clear()
+        self.counter = count()
+
+class BucketFrontier:
+    """Dial's bucket queue for small non-negative integer priorities.
+    
+    One FIFO bucket per priority value and a cursor at the lowest non-empty
+    bucket give O(1) amortized push/pop when priorities rarely decrease,
+    which holds for unit-cost grids with a consistent heuristic. Ties pop
+    in insertion order, or newest first with lifo, like HeapFrontier.
+    """
+    
+    def __init__(self, lifo=False):
+        self.buckets = []
+        self.lifo = lifo
+        self.cursor = 0
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def push(self, priority, item):
+        if priority >= len(self.buckets):
+            self.buckets.extend(deque() for _ in range(priority + 1 - len(self.buckets)))
+        self.buckets[priority].append(item)
+        if priority < self.cursor:
+            self.cursor = priority
+        self.size += 1
+    
+    def pop(self):
+        """Remove and return (priority, item) with the lowest priority"""
+        if not self.size:
+            raise IndexError("pop from an empty frontier")
+        buckets = self.buckets
+        while not buckets[self.cursor]:
+            self.cursor += 1
+        self.size -= 1
+        bucket = buckets[self.cursor]
+        return self.cursor, bucket.pop() if self.lifo else bucket.popleft()
+    
+    def clear(self):
+        for bucket in self.buckets:
+            bucket.clear()
+        self.cursor = 0
+        self.size = 0
+
+FRONTIERS = {
+    "heap": HeapFrontier,
+    "bucket": BucketFrontier
+}
+
+def make_frontier(kind, lifo=False):
+    """Create a frontier backend by name ("heap" or "bucket")"""
+    if kind not in FRONTIERS:
+        raise ValueError(f"Unknown frontier '{kind}', expected one of {', '.join(FRONTIERS)}")
+    return FRONTIERS[kind](lifo)
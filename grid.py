@@ -2,94 +2,214 @@
 
 import pygame
 import random
+import hashlib
+from array import array
 from constants import *
+from connectivity import ConnectivityIndex
+from hierarchy import ContractionHierarchy
+
+class SolverState:
+    """Visualization flags owned by one solver, one byte per cell.
+    
+    A cell's flags only count while its stamp equals the current epoch, so
+    clear() starts a new epoch instead of rewriting every cell.
+    """
+    
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.flags = bytearray(rows * cols)
+        self.stamps = array('I', bytes(4 * rows * cols))
+        self.epoch = 1
+    
+    def get(self, row, col):
+        return self.value(row * self.cols + col)
+    
+    def value(self, index):
+        """Flags of a flat cell index; stale flags from earlier epochs read as clear"""
+        return self.flags[index] if self.stamps[index] == self.epoch else 0
+    
+    def set(self, index, flags):
+        self.flags[index] = flags
+        self.stamps[index] = self.epoch
+    
+    def mark_visited(self, index):
+        epoch = self.epoch
+        previous = self.flags[index] if self.stamps[index] == epoch else 0
+        self.flags[index] = (previous | STATE_VISITED) & ~STATE_FRONTIER
+        self.stamps[index] = epoch
+    
+    def mark_frontier(self, index):
+        epoch = self.epoch
+        previous = self.flags[index] if self.stamps[index] == epoch else 0
+        self.flags[index] = previous | STATE_FRONTIER
+        self.stamps[index] = epoch
+    
+    def mark_path(self, index):
+        epoch = self.epoch
+        previous = self.flags[index] if self.stamps[index] == epoch else 0
+        self.flags[index] = previous | STATE_PATH
+        self.stamps[index] = epoch
+    
+    def clear(self):
+        self.epoch += 1
+        if self.epoch >= MAX_EPOCH:
+            self.stamps = array('I', bytes(4 * len(self.flags)))
+            self.epoch = 1
+    
+    def copy(self):
+        """Independent copy of the flags, safe to read while the owner keeps writing"""
+        state = SolverState(self.rows, self.cols)
+        state.flags[:] = self.flags
+        state.stamps[:] = self.stamps
+        state.epoch = self.epoch
+        return state
 
 class Cell:
-    def __init__(self, row, col):
+    def __init__(self, row, col, grid, index):
         self.row = row
         self.col = col
+        self.index = index
+        self.grid = grid
         self.x = col * CELL_SIZE
         self.y = row * CELL_SIZE + UI_HEIGHT
         self.color = WHITE
-        self.wall = False
         self.start = False
         self.goal = False
-        self.visited = False
-        self.in_frontier = False
-        self.in_path = False
     
-    def draw(self, screen):
+    @property
+    def wall(self):
+        return self.grid.walls[self.index] == 1
+    
+    @wall.setter
+    def wall(self, value):
+        self.grid.set_wall(self.index, value)
+    
+    def draw(self, screen, flags=0, x=None, y=None, size=CELL_SIZE, palette=SOLVER_PALETTES[0]):
+        """Draw the cell with the given solver flags, optionally at another position and size"""
+        x = self.x if x is None else x
+        y = self.y if y is None else y
+        visited_color, frontier_color, path_color, path_highlight = palette
+        
         # Draw cell background
-        pygame.draw.rect(screen, self.color, (self.x, self.y, CELL_SIZE, CELL_SIZE))
+        pygame.draw.rect(screen, self.color, (x, y, size, size))
         
         # Draw cell border (lighter for better visual)
-        border_color = (220, 220, 220) if not (self.visited or self.in_frontier or self.in_path) else self.color
-        pygame.draw.rect(screen, border_color, (self.x, self.y, CELL_SIZE, CELL_SIZE), 1)
+        border_color = (220, 220, 220) if not flags else self.color
+        pygame.draw.rect(screen, border_color, (x, y, size, size), 1)
         
         # Draw wall if present
         if self.wall:
-            pygame.draw.rect(screen, BLACK, (self.x, self.y, CELL_SIZE, CELL_SIZE))
+            pygame.draw.rect(screen, BLACK, (x, y, size, size))
             # Add texture to walls
-            for i in range(0, CELL_SIZE, 3):
+            for i in range(0, size, 3):
                 pygame.draw.line(screen, DARK_GRAY, 
-                               (self.x, self.y + i), 
-                               (self.x + CELL_SIZE, self.y + i), 1)
+                               (x, y + i), 
+                               (x + size, y + i), 1)
         
         # Draw special markers with highlights
         if self.start:
-            pygame.draw.rect(screen, RED, (self.x, self.y, CELL_SIZE, CELL_SIZE))
+            pygame.draw.rect(screen, RED, (x, y, size, size))
             # Add highlight
-            pygame.draw.rect(screen, (255, 150, 150), (self.x + 2, self.y + 2, CELL_SIZE - 4, CELL_SIZE - 4))
-            pygame.draw.rect(screen, RED, (self.x + 4, self.y + 4, CELL_SIZE - 8, CELL_SIZE - 8))
+            pygame.draw.rect(screen, (255, 150, 150), (x + 2, y + 2, size - 4, size - 4))
+            pygame.draw.rect(screen, RED, (x + 4, y + 4, size - 8, size - 8))
         elif self.goal:
-            pygame.draw.rect(screen, YELLOW, (self.x, self.y, CELL_SIZE, CELL_SIZE))
+            pygame.draw.rect(screen, YELLOW, (x, y, size, size))
             # Add highlight
-            pygame.draw.rect(screen, (255, 255, 150), (self.x + 2, self.y + 2, CELL_SIZE - 4, CELL_SIZE - 4))
-            pygame.draw.rect(screen, YELLOW, (self.x + 4, self.y + 4, CELL_SIZE - 8, CELL_SIZE - 8))
-        elif self.in_path:
-            pygame.draw.rect(screen, GREEN, (self.x, self.y, CELL_SIZE, CELL_SIZE))
+            pygame.draw.rect(screen, (255, 255, 150), (x + 2, y + 2, size - 4, size - 4))
+            pygame.draw.rect(screen, YELLOW, (x + 4, y + 4, size - 8, size - 8))
+        elif flags & STATE_PATH:
+            pygame.draw.rect(screen, path_color, (x, y, size, size))
             # Add animation effect
-            pygame.draw.rect(screen, (150, 255, 150), (self.x + 2, self.y + 2, CELL_SIZE - 4, CELL_SIZE - 4))
-        elif self.in_frontier:
-            pygame.draw.rect(screen, ORANGE, (self.x, self.y, CELL_SIZE, CELL_SIZE))
-        elif self.visited:
-            pygame.draw.rect(screen, LIGHT_BLUE, (self.x, self.y, CELL_SIZE, CELL_SIZE))
-    
-    def reset_state(self):
-        """Reset algorithm-related states but keep walls, start, and goal"""
-        self.visited = False
-        self.in_frontier = False
-        self.in_path = False
-        if not self.wall and not self.start and not self.goal:
-            self.color = WHITE
-    
-    def reset_all(self):
-        """Reset all states including walls, start, and goal"""
-        self.wall = False
-        self.start = False
-        self.goal = False
-        self.visited = False
-        self.in_frontier = False
-        self.in_path = False
-        self.color = WHITE
+            pygame.draw.rect(screen, path_highlight, (x + 2, y + 2, size - 4, size - 4))
+        elif flags & STATE_FRONTIER:
+            pygame.draw.rect(screen, frontier_color, (x, y, size, size))
+        elif flags & STATE_VISITED:
+            pygame.draw.rect(screen, visited_color, (x, y, size, size))
+    
+    def draw_overlay(self, screen, flags, inset, palette):
+        """Draw another solver's flags as an inset square on top of the cell"""
+        if not flags or self.wall or self.start or self.goal:
+            return
+        
+        if flags & STATE_PATH:
+            color = palette[2]
+        elif flags & STATE_FRONTIER:
+            color = palette[1]
+        else:
+            color = palette[0]
+        pygame.draw.rect(screen, color, (self.x + inset, self.y + inset, CELL_SIZE - 2 * inset, CELL_SIZE - 2 * inset))
 
 class Grid:
-    def __init__(self):
-        self.rows = GRID_HEIGHT
-        self.cols = GRID_WIDTH
-        self.cells = [[Cell(row, col) for col in range(self.cols)] for row in range(self.rows)]
+    def __init__(self, rows=GRID_HEIGHT, cols=GRID_WIDTH):
+        self.rows = rows
+        self.cols = cols
+        self.walls = bytearray(rows * cols)  # One byte per cell, 1 = wall
+        self.version = 0  # Incremented on every wall edit
+        self.connectivity = ConnectivityIndex(self)
+        self.hierarchy = None  # Contraction hierarchy, built on first use
+        self.cells = [[Cell(row, col, self, row * cols + col) for col in range(self.cols)] for row in range(self.rows)]
         self.start_pos = None
         self.goal_pos = None
     
-    def draw(self, screen):
+    def draw(self, screen, states=(), view="overlay"):
+        """Draw the grid composited with the given solver states"""
+        if view == "split" and len(states) > 1:
+            self.draw_split(screen, states)
+            return
+        
         # Draw grid background
         grid_rect = pygame.Rect(0, UI_HEIGHT, WINDOW_WIDTH - SIDEBAR_WIDTH, WINDOW_HEIGHT - UI_HEIGHT)
         pygame.draw.rect(screen, (245, 245, 245), grid_rect)
         
-        # Draw cells
+        # Draw cells; the first state fills the cell, later states are drawn as insets
+        base_state = states[0] if states else None
         for row in self.cells:
             for cell in row:
-                cell.draw(screen)
+                index = cell.index
+                cell.draw(screen, base_state.value(index) if base_state else 0)
+                for i, state in enumerate(states[1:], 1):
+                    palette = SOLVER_PALETTES[i % len(SOLVER_PALETTES)]
+                    cell.draw_overlay(screen, state.value(index), 4 * i, palette)
+    
+    def draw_split(self, screen, states):
+        """Draw one scaled-down copy of the grid per solver state, side by side"""
+        grid_width = WINDOW_WIDTH - SIDEBAR_WIDTH
+        grid_height = WINDOW_HEIGHT - UI_HEIGHT
+        pygame.draw.rect(screen, (245, 245, 245), (0, UI_HEIGHT, grid_width, grid_height))
+        
+        panel_width = grid_width // len(states)
+        size = max(2, min(panel_width // self.cols, grid_height // self.rows))
+        top = UI_HEIGHT + (grid_height - size * self.rows) // 2
+        
+        for i, state in enumerate(states):
+            left = i * panel_width + (panel_width - size * self.cols) // 2
+            palette = SOLVER_PALETTES[i % len(SOLVER_PALETTES)]
+            for row in self.cells:
+                for cell in row:
+                    flags = state.value(cell.index)
+                    cell.draw(screen, flags, left + cell.col * size, top + cell.row * size, size, palette)
+    
+    def draw_agents(self, screen, paths, t):
+        """Draw multi-agent paths as colored lines with each agent's position at time t"""
+        half = CELL_SIZE // 2
+        for agent, path in enumerate(paths):
+            if not path:
+                continue
+            color = pygame.Color(0)
+            color.hsva = ((agent * 137) % 360, 80, 90, 100)
+            points = [(col * CELL_SIZE + half, row * CELL_SIZE + UI_HEIGHT + half) for row, col in path]
+            
+            # Path line and goal marker
+            if len(points) > 1:
+                pygame.draw.lines(screen, color, False, points, 2)
+            goal_x, goal_y = points[-1]
+            pygame.draw.rect(screen, color, (goal_x - half + 3, goal_y - half + 3, CELL_SIZE - 6, CELL_SIZE - 6), 2)
+            
+            # Agent at its position for time t
+            x, y = points[min(t, len(points) - 1)]
+            pygame.draw.circle(screen, color, (x, y), half - 3)
+            pygame.draw.circle(screen, BLACK, (x, y), half - 3, 1)
     
     def get_cell(self, pos):
         """Get cell at mouse position"""
@@ -104,6 +224,23 @@ class Grid:
             return self.cells[row][col]
         return None
     
+    def set_wall(self, index, value):
+        """Set or clear the wall at a flat index, keeping the connectivity index current"""
+        value = 1 if value else 0
+        if self.walls[index] == value:
+            return
+        self.walls[index] = value
+        self.version += 1
+        if value:
+            self.connectivity.cell_closed(index)
+        else:
+            self.connectivity.cell_opened(index)
+    
+    def is_reachable(self, start_pos, goal_pos):
+        """Whether goal_pos can be reached from start_pos, answered from the connectivity index"""
+        return self.connectivity.connected(start_pos[0] * self.cols + start_pos[1],
+                                           goal_pos[0] * self.cols + goal_pos[1])
+    
     def toggle_wall(self, cell):
         """Toggle wall state for a cell"""
         if cell and not cell.start and not cell.goal:
@@ -141,17 +278,39 @@ class Grid:
     
     def clear_grid(self):
         """Clear all cells (walls, start, goal)"""
-        for row in self.cells:
-            for cell in row:
-                cell.reset_all()
+        self.walls[:] = bytes(len(self.walls))
+        self.version += 1
+        self.connectivity.invalidate()
+        # Only the start and goal cells carry flags of their own
+        for pos in (self.start_pos, self.goal_pos):
+            if pos:
+                cell = self.cells[pos[0]][pos[1]]
+                cell.start = False
+                cell.goal = False
         self.start_pos = None
         self.goal_pos = None
     
-    def reset_algorithm(self):
-        """Reset algorithm visualization but keep walls, start, and goal"""
-        for row in self.cells:
-            for cell in row:
-                cell.reset_state()
+    def reset_algorithm(self, states=()):
+        """Reset algorithm visualization but keep walls, start, and goal.
+        
+        Run marks live in SolverState buffers rather than in cells, so this
+        only starts a new epoch in each given state.
+        """
+        for state in states:
+            state.clear()
+    
+    def contraction_hierarchy(self):
+        """Contraction hierarchy of the current walls, rebuilt only after they change"""
+        if self.hierarchy is None or not self.hierarchy.is_current():
+            self.hierarchy = ContractionHierarchy(self)
+        return self.hierarchy
+    
+    def layout_hash(self):
+        """Short stable hash of the walls, start and goal of this grid"""
+        digest = hashlib.sha1()
+        digest.update(f"{self.rows}x{self.cols}|{self.start_pos}|{self.goal_pos}|".encode())
+        digest.update(bytes(self.walls))
+        return digest.hexdigest()[:16]
     
     def get_neighbors(self, row, col, diagonals=False):
         """Get valid neighboring cells (up, down, left, right)"""
@@ -167,19 +326,35 @@ class Grid:
         
         return neighbors
     
-    def generate_maze_prim(self):
-        """Generate a random maze using Prim's algorithm"""
+    def neighbor_indices(self, index):
+        """Flat indices of open neighbors, in the same order as get_neighbors"""
+        walls = self.walls
+        cols = self.cols
+        col = index % cols
+        neighbors = []
+        if col + 1 < cols and not walls[index + 1]:
+            neighbors.append(index + 1)
+        if index + cols < len(walls) and not walls[index + cols]:
+            neighbors.append(index + cols)
+        if col > 0 and not walls[index - 1]:
+            neighbors.append(index - 1)
+        if index >= cols and not walls[index - cols]:
+            neighbors.append(index - cols)
+        return neighbors
+    
+    def generate_maze_prim(self, rng=random):
+        """Generate a random maze using Prim's algorithm; rng may be a seeded random.Random"""
         # Reset grid first
         self.clear_grid()
         
-        # Initialize all cells as walls
-        for row in self.cells:
-            for cell in row:
-                cell.wall = True
+        # Initialize all cells as walls; carving below joins regions incrementally
+        self.walls[:] = b"\x01" * len(self.walls)
+        self.version += 1
+        self.connectivity.all_walls()
         
         # Start from a random cell
-        start_row = random.randint(0, self.rows - 1)
-        start_col = random.randint(0, self.cols - 1)
+        start_row = rng.randint(0, self.rows - 1)
+        start_col = rng.randint(0, self.cols - 1)
         self.cells[start_row][start_col].wall = False
         
         # Add frontier cells
@@ -191,7 +366,7 @@ class Grid:
         
         while frontiers:
             # Pick a random frontier cell
-            row, col = random.choice(frontiers)
+            row, col = rng.choice(frontiers)
             frontiers.remove((row, col))
             
             # Find all neighbors that are passages
@@ -203,7 +378,7 @@ class Grid:
             
             if neighbors:
                 # Connect the frontier cell to a random neighbor
-                n_row, n_col = random.choice(neighbors)
+                n_row, n_col = rng.choice(neighbors)
                 
                 # Remove the wall between them
                 wall_row = (row + n_row) // 2
@@ -0,0 +1,207 @@
+# hierarchy.py
+
+import hashlib
+import heapq
+import struct
+import time
+from array import array
+from constants import CH_WITNESS_LIMIT
+
+HIERARCHY_MAGIC = b"PFCH01"
+HIERARCHY_HEADER = struct.Struct("<6sII20sI")  # magic, rows, cols, wall digest, upward edge count
+
+def wall_digest(grid):
+    """SHA-1 of the wall layout; start and goal do not affect the hierarchy"""
+    return hashlib.sha1(bytes(grid.walls)).digest()
+
+class ContractionHierarchy:
+    """Contraction hierarchy over the open cells of a grid, for fast repeated queries.
+    
+    Cells are contracted one at a time, least important first. Whenever
+    removing a cell would lengthen the shortest path between two of its
+    remaining neighbors, a shortcut edge is added that remembers the
+    bypassed cell. Every edge is stored once, at its lower-ranked end, so
+    queries only search upwards from both endpoints. A hierarchy describes
+    one wall layout and goes stale once the grid's walls change.
+    """
+    
+    def __init__(self, grid, build=True):
+        self.grid = grid
+        self.rows = grid.rows
+        self.cols = grid.cols
+        cells = grid.rows * grid.cols
+        self.rank = array('i', [-1]) * cells  # Contraction order, -1 for walls
+        # Upward edges of cell i are targets[first[i]:first[i + 1]]
+        self.first = array('i', [0]) * (cells + 1)
+        self.targets = array('i')
+        self.weights = array('i')
+        self.middles = array('i')  # Bypassed cell of a shortcut, -1 for grid moves
+        self.version = grid.version
+        self.digest = wall_digest(grid)
+        self.shortcuts = 0
+        self.build_time = 0
+        if build:
+            self.build()
+    
+    def is_current(self):
+        """Whether the hierarchy still matches the grid's walls"""
+        if self.version == self.grid.version:
+            return True
+        # Edits that restored the original walls keep the hierarchy usable
+        if wall_digest(self.grid) == self.digest:
+            self.version = self.grid.version
+            return True
+        return False
+    
+    def witness_search(self, graph, source, avoid, via, limit):
+        """Targets in via that keep needing a shortcut after a bounded Dijkstra from source.
+        
+        via maps each target to its cost through avoid; a target is witnessed
+        by any path around avoid that is no longer, settled or not.
+        """
+        pending = set(via)
+        max_cost = max(via.values())
+        distance = {source: 0}
+        heap = [(0, source)]
+        settled = 0
+        while heap and settled < limit:
+            cost, cell = heapq.heappop(heap)
+            if cost > max_cost:
+                break
+            if cost > distance[cell]:
+                continue
+            settled += 1
+            for neighbor, (weight, _) in graph[cell].items():
+                if neighbor == avoid:
+                    continue
+                new_cost = cost + weight
+                if new_cost < distance.get(neighbor, new_cost + 1):
+                    distance[neighbor] = new_cost
+                    heapq.heappush(heap, (new_cost, neighbor))
+                    if neighbor in pending and new_cost <= via[neighbor]:
+                        pending.discard(neighbor)
+                        if not pending:
+                            return pending
+        return pending
+    
+    def find_shortcuts(self, graph, cell, limit):
+        """(a, b, weight) shortcuts needed to contract cell, one per neighbor pair without a witness"""
+        edges = graph[cell]
+        neighbors = list(edges)
+        shortcuts = []
+        for i, source in enumerate(neighbors[:-1]):
+            to_source = edges[source][0]
+            via = {target: to_source + edges[target][0] for target in neighbors[i + 1:]}
+            for target in self.witness_search(graph, source, cell, via, limit):
+                shortcuts.append((source, target, via[target]))
+        return shortcuts
+    
+    def build(self, witness_limit=CH_WITNESS_LIMIT):
+        """Contract every open cell and store the upward edges"""
+        begin = time.perf_counter()
+        grid = self.grid
+        cells = self.rows * self.cols
+        
+        # Remaining graph: neighbor -> (weight, bypassed cell) per uncontracted cell
+        graph = [None] * cells
+        for index in range(cells):
+            if not grid.walls[index]:
+                graph[index] = {neighbor: (1, -1) for neighbor in grid.neighbor_indices(index)}
+        upward = [None] * cells
+        contracted_neighbors = [0] * cells
+        level = [0] * cells  # Longest chain of contracted cells below
+        
+        def priority(cell, shortcuts):
+            # The edge difference keeps the hierarchy sparse; contracted
+            # neighbors and level spread contractions evenly over the grid
+            edge_difference = len(shortcuts) - len(graph[cell])
+            return 2 * edge_difference + contracted_neighbors[cell] + level[cell]
+        
+        heap = []
+        for index in range(cells):
+            if graph[index] is not None:
+                heap.append((priority(index, self.find_shortcuts(graph, index, witness_limit)), index))
+        heapq.heapify(heap)
+        
+        rank = 0
+        self.shortcuts = 0
+        while heap:
+            _, cell = heapq.heappop(heap)
+            # Lazy update: contract only if the cell is still the least important
+            shortcuts = self.find_shortcuts(graph, cell, witness_limit)
+            current = priority(cell, shortcuts)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, cell))
+                continue
+            
+            self.rank[cell] = rank
+            rank += 1
+            edges = graph[cell]
+            upward[cell] = edges  # Every remaining neighbor is contracted later
+            graph[cell] = None
+            for neighbor in edges:
+                del graph[neighbor][cell]
+                contracted_neighbors[neighbor] += 1
+                level[neighbor] = max(level[neighbor], level[cell] + 1)
+            for a, b, weight in shortcuts:
+                existing = graph[a].get(b)
+                if existing is None or weight < existing[0]:
+                    graph[a][b] = graph[b][a] = (weight, cell)
+                    self.shortcuts += 1
+        
+        first = self.first
+        for index in range(cells):
+            first[index] = len(self.targets)
+            for neighbor, (weight, middle) in (upward[index] or {}).items():
+                self.targets.append(neighbor)
+                self.weights.append(weight)
+                self.middles.append(middle)
+        first[cells] = len(self.targets)
+        self.build_time = time.perf_counter() - begin
+    
+    def edge(self, a, b):
+        """(weight, bypassed cell) of the edge between a and b"""
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        for edge in range(self.first[low], self.first[low + 1]):
+            if self.targets[edge] == high:
+                return self.weights[edge], self.middles[edge]
+        raise KeyError(f"no hierarchy edge between cells {a} and {b}")
+    
+    def unpack(self, a, b):
+        """Grid cells along the edge from a to b, excluding a"""
+        cells = []
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            middle = self.edge(a, b)[1]
+            if middle < 0:
+                cells.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return cells
+    
+    def save(self, filename):
+        """Write the hierarchy with the digest of the walls it was built for"""
+        with open(filename, 'wb') as f:
+            f.write(HIERARCHY_HEADER.pack(HIERARCHY_MAGIC, self.rows, self.cols, self.digest, len(self.targets)))
+            for values in (self.rank, self.first, self.targets, self.weights, self.middles):
+                f.write(values.tobytes())
+        return filename
+    
+    @classmethod
+    def load(cls, grid, filename):
+        """Read a saved hierarchy for grid; ValueError if it was built for other walls"""
+        with open(filename, 'rb') as f:
+            magic, rows, cols, digest, edges = HIERARCHY_HEADER.unpack(f.read(HIERARCHY_HEADER.size))
+            if magic != HIERARCHY_MAGIC:
+                raise ValueError(f"{filename} is not a contraction hierarchy")
+            if (rows, cols) != (grid.rows, grid.cols) or digest != wall_digest(grid):
+                raise ValueError(f"{filename} was built for a different wall layout")
+            hierarchy = cls(grid, build=False)
+            for values, count in ((hierarchy.rank, rows * cols), (hierarchy.first, rows * cols + 1)):
+                values[:] = array('i', f.read(count * values.itemsize))
+            for values in (hierarchy.targets, hierarchy.weights, hierarchy.middles):
+                values.frombytes(f.read(edges * values.itemsize))
+        hierarchy.shortcuts = sum(1 for middle in hierarchy.middles if middle >= 0)
+        return hierarchy
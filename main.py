@@ -2,10 +2,10 @@
 
 import pygame
 import sys
-import time
 from grid import Grid
 from algorithms import BFS, AStar
 from ui import UI
+from reporting import RunLog
 from constants import *
 
 def main():
@@ -23,6 +23,7 @@ def main():
         "BFS": BFS(grid),
         "A*": AStar(grid)
     }
+    run_log = RunLog(RUN_LOG_PATH)
     
     # Main game loop
     clock = pygame.time.Clock()
@@ -34,6 +35,10 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
             
+            # Handle playback keys
+            if ui.handle_key(event, grid):
+                continue
+            
             # Handle UI events
             ui_handled = ui.handle_event(event, grid, algorithms)
             
@@ -45,35 +50,53 @@ def main():
                 
                 # Handle mouse drag for drawing walls
                 elif event.type == pygame.MOUSEMOTION and pygame.mouse.get_pressed()[0]:
-                    if ui.mode == "draw":
+                    if ui.mode == "draw" and not ui.searching():
                         cell = grid.get_cell(event.pos)
                         if cell and not cell.start and not cell.goal:
                             cell.wall = True
         
-        # Run algorithm step if an algorithm is running
-        if ui.algorithm_running and ui.current_algorithm:
-            finished = ui.current_algorithm.run_step()
-            if finished:
-                # Algorithm finished - show result and generate PDF
+        # Search in a background worker, then replay the recordings
+        if ui.algorithm_running and ui.solvers and not ui.players:
+            if ui.worker is None:
+                ui.start_search()
+        
+        if ui.worker is not None and ui.worker.done():
+            # Append each run to the run log, and write a PDF only if enabled
+            for algorithm in ui.solvers:
+                algorithm_name = type(algorithm).__name__
+                run_log.append(algorithm.run_record(algorithm_name))
+                if PDF_REPORTS:
+                    try:
+                        pdf_filename = algorithm.generate_pdf_report(algorithm_name)
+                        ui.message.show(f"PDF report generated: {pdf_filename}", LIGHT_BLUE, 5000)
+                    except ImportError:
+                        ui.message.show("PDF reports need fpdf installed", RED)
+            
+            ui.start_playback()
+        
+        # Advance playback; show the result once every replay reaches the end
+        if ui.players:
+            finished = all([player.update() for player in ui.players])
+            if finished and ui.algorithm_running:
                 ui.algorithm_running = False
-                ui.current_algorithm.end_time = time.time()
                 
-                if ui.current_algorithm.found:
+                if len(ui.solvers) > 1:
+                    results = [f"{type(a).__name__}: {a.path_length if a.found else '-'} ({a.nodes_explored} nodes)"
+                               for a in ui.solvers]
+                    ui.message.show(" | ".join(results), LIGHT_BLUE, 5000)
+                elif ui.current_algorithm.found:
                     ui.message.show(f"Path found! Length: {ui.current_algorithm.path_length}", GREEN)
-                    # Generate PDF report
-                    pdf_filename = ui.current_algorithm.generate_pdf_report(type(ui.current_algorithm).__name__)
-                    ui.message.show(f"PDF report generated: {pdf_filename}", LIGHT_BLUE, 5000)
                 else:
                     ui.message.show("No path found!", RED)
-                    # Generate PDF report even if no path found
-                    pdf_filename = ui.current_algorithm.generate_pdf_report(type(ui.current_algorithm).__name__)
-                    ui.message.show(f"PDF report generated: {pdf_filename}", LIGHT_BLUE, 5000)
                 
                 ui.clear_algorithm_buttons()
         
         # Draw everything
         screen.fill(WHITE)
-        grid.draw(screen)
+        grid.draw(screen, ui.visible_states(), ui.view)
+        if ui.agent_paths:
+            ui.update_agents()
+            grid.draw_agents(screen, ui.agent_paths, ui.agent_time())
         ui.draw(screen)
         
         # Update display
@@ -0,0 +1,312 @@
+# multiagent.py
+
+import random
+import time
+from array import array
+from collections import deque
+from algorithms import AStar
+from frontier import make_frontier
+
+def distance_map(grid, goal):
+    """True grid distance from every cell to goal (-1 if unreachable), by reverse BFS"""
+    distances = array('i', [-1]) * (grid.rows * grid.cols)
+    distances[goal] = 0
+    queue = deque([goal])
+    while queue:
+        current = queue.popleft()
+        for neighbor in grid.neighbor_indices(current):
+            if distances[neighbor] < 0:
+                distances[neighbor] = distances[current] + 1
+                queue.append(neighbor)
+    return distances
+
+class ReservationTable:
+    """Space-time reservations of cells and edges, keyed by int-encoded (time, cell)"""
+    
+    def __init__(self, size):
+        self.size = size
+        self.cells = {}  # t * size + cell -> agent
+        self.edges = set()  # (t * size + from) * size + to, for moves from t to t + 1
+        self.resting = {}  # cell -> time from which an agent stays there forever
+    
+    def reserve_path(self, path, start_time, agent, rest=False):
+        """Reserve every cell of a path of flat indices, one per time step"""
+        size = self.size
+        for offset, cell in enumerate(path):
+            t = start_time + offset
+            self.cells[t * size + cell] = agent
+            if offset:
+                self.edges.add(((t - 1) * size + path[offset - 1]) * size + cell)
+        if rest:
+            self.resting[path[-1]] = start_time + len(path) - 1
+    
+    def can_move(self, a, b, t):
+        """Whether an agent at cell a at time t may be at cell b at time t + 1"""
+        size = self.size
+        if (t + 1) * size + b in self.cells:
+            return False
+        if self.resting.get(b, t + 2) <= t + 1:
+            return False
+        # No swapping places with an agent moving from b to a
+        return (t * size + b) * size + a not in self.edges
+    
+    def can_rest(self, cell, t, horizon):
+        """Whether an agent may stay at cell from time t onwards"""
+        size = self.size
+        return not any((step * size + cell) in self.cells for step in range(t + 1, horizon + 1))
+
+class SpaceTimeAStar(AStar):
+    """A* over (cell, time) states that avoids reserved cells and edges.
+    
+    States are encoded as t * size + cell. Every move, including waiting in
+    place, costs one step, so g is implied by t and the first time a state
+    is generated is also its cheapest. Searches are never replayed, so no
+    recording or per-cell visualization state is kept.
+    """
+    display_name = "Space-time A*"
+    
+    def __init__(self, grid, table, frontier="bucket"):
+        super().__init__(grid, frontier, record=False)
+        # Newest-first ties follow one route deeper instead of widening across equal-f states
+        self.open_set = make_frontier(frontier, lifo=True)
+        self.table = table
+        self.closed_states = set()
+        self.parent_states = {}
+        self.cell_path = []
+    
+    def find(self, start, goal, start_time, distances, window=None, max_time=None):
+        """Return the flat-index path from start at start_time, or None.
+        
+        With a window the search stops at that depth (WHCA*); otherwise it
+        stops at the goal once the goal is free for the rest of the plan.
+        """
+        self.source = start
+        self.target = goal
+        self.start_step = start_time
+        self.distances = distances
+        self.window = window
+        self.max_time = max_time if max_time is not None else start_time + 4 * (self.grid.rows + self.grid.cols)
+        self.solve()
+        return list(self.cell_path) if self.found else None
+    
+    def start(self):
+        """Initialize a search from the configured source"""
+        self.found = False
+        self.nodes_explored = 0
+        self.cell_path.clear()
+        if self.distances[self.source] < 0:
+            return False
+        
+        self.open_set.clear()
+        self.closed_states.clear()
+        self.parent_states.clear()
+        self.start_time = time.time()
+        
+        key = self.start_step * self.table.size + self.source
+        self.parent_states[key] = -1
+        self.open_set.push(self.distances[self.source], key)
+        return True
+    
+    def run_step(self):
+        """Expand one (cell, time) state"""
+        if self.found or not self.open_set:
+            return True
+        
+        _, key = self.open_set.pop()
+        if key in self.closed_states:
+            return False
+        self.closed_states.add(key)
+        self.nodes_explored += 1
+        
+        size = self.table.size
+        t, cell = divmod(key, size)
+        depth = t - self.start_step
+        if self.window is not None:
+            done = depth >= self.window
+        else:
+            done = cell == self.target and self.table.can_rest(cell, t, self.max_time)
+        if done:
+            self.found = True
+            while key != -1:
+                self.cell_path.append(key % size)
+                key = self.parent_states[key]
+            self.cell_path.reverse()
+            self.path_length = len(self.cell_path) - 1
+            return True
+        
+        if t >= self.max_time:
+            return False
+        
+        # Move to a neighbor or wait in place
+        for neighbor in self.grid.neighbor_indices(cell) + [cell]:
+            h = self.distances[neighbor]
+            if h < 0 or not self.table.can_move(cell, neighbor, t):
+                continue
+            next_key = key + size - cell + neighbor
+            if next_key in self.parent_states:
+                continue
+            self.parent_states[next_key] = key
+            self.open_set.push(depth + 1 + h, next_key)
+        
+        return False
+
+class CooperativePlanner:
+    """Plans collision-free paths for many agents with cooperative A*.
+    
+    Agents are planned one at a time in priority order, each reserving its
+    path in a shared space-time table. With a window the planner runs
+    windowed cooperative A* (WHCA*): every agent plans only window steps
+    ahead and the plan is rebuilt every window // 2 steps.
+    """
+    
+    def __init__(self, grid, window=None, order="distance", frontier="bucket", max_time=None):
+        self.grid = grid
+        self.window = window
+        self.order = order
+        self.frontier = frontier
+        self.max_time = max_time if max_time is not None else 4 * (grid.rows + grid.cols)
+        self.nodes_explored = 0
+        self.planning_time = 0.0
+        self.failed = []
+    
+    def prioritize(self, starts, goals, distances):
+        """Agent indices in planning order"""
+        agents = list(range(len(starts)))
+        if self.order == "distance":
+            # Longest trips first; they have the fewest alternative routes in time
+            agents.sort(key=lambda agent: -distances[agent][starts[agent]])
+        return agents
+    
+    def plan(self, agents):
+        """Plan paths for (start_pos, goal_pos) pairs.
+        
+        Returns one list of (row, col) positions per agent, indexed by time
+        step, or None for agents that could not be planned.
+        """
+        cols = self.grid.cols
+        starts = [row * cols + col for (row, col), _ in agents]
+        goals = [row * cols + col for _, (row, col) in agents]
+        
+        begin = time.perf_counter()
+        self.nodes_explored = 0
+        self.failed = []
+        goal_distances = {}
+        distances = []
+        for goal in goals:
+            if goal not in goal_distances:
+                goal_distances[goal] = distance_map(self.grid, goal)
+            distances.append(goal_distances[goal])
+        
+        order = self.prioritize(starts, goals, distances)
+        # Agents that can never reach their goal stay on their start cell;
+        # planning them first reserves those cells before anyone routes through
+        order = ([agent for agent in order if distances[agent][starts[agent]] < 0] +
+                 [agent for agent in order if distances[agent][starts[agent]] >= 0])
+        if self.window is None:
+            paths = self.plan_cooperative(starts, goals, distances, order)
+        else:
+            paths = self.plan_windowed(starts, goals, distances, order)
+        self.planning_time = time.perf_counter() - begin
+        
+        return [[divmod(cell, cols) for cell in path] if path else None for path in paths]
+    
+    def plan_cooperative(self, starts, goals, distances, order):
+        table = ReservationTable(self.grid.rows * self.grid.cols)
+        search = SpaceTimeAStar(self.grid, table, self.frontier)
+        paths = [None] * len(starts)
+        
+        for agent in order:
+            path = search.find(starts[agent], goals[agent], 0, distances[agent], max_time=self.max_time)
+            self.nodes_explored += search.nodes_explored
+            if path is None:
+                # Unplanned agents stay where they are
+                self.failed.append(agent)
+                path = [starts[agent]]
+            else:
+                paths[agent] = path
+            table.reserve_path(path, 0, agent, rest=True)
+        
+        return paths
+    
+    def plan_windowed(self, starts, goals, distances, order):
+        size = self.grid.rows * self.grid.cols
+        window = max(self.window, 2)
+        advance = window // 2
+        paths = [[start] for start in starts]
+        positions = list(starts)
+        t = 0
+        
+        # Agents that can never reach their goal just hold their start cell
+        targets = [goal if distances[agent][start] >= 0 else start
+                   for agent, (start, goal) in enumerate(zip(starts, goals))]
+        holding = [distance_map(self.grid, start) if target == start and start != goals[agent] else None
+                   for agent, (start, target) in enumerate(zip(starts, targets))]
+        
+        # One search for every round; only its reservations start over
+        search = SpaceTimeAStar(self.grid, None, self.frontier)
+        while t < self.max_time and positions != targets:
+            table = search.table = ReservationTable(size)
+            for agent in order:
+                agent_distances = holding[agent] or distances[agent]
+                segment = search.find(positions[agent], targets[agent], t, agent_distances, window=window)
+                self.nodes_explored += search.nodes_explored
+                if segment is None:
+                    segment = [positions[agent]] * (window + 1)
+                table.reserve_path(segment, t, agent)
+                paths[agent].extend(segment[1:advance + 1])
+                positions[agent] = segment[advance]
+            t += advance
+        
+        for agent in order:
+            if positions[agent] != goals[agent]:
+                self.failed.append(agent)
+            else:
+                # Drop the waiting steps after the agent's final arrival
+                path = paths[agent]
+                while len(path) > 1 and path[-2] == goals[agent]:
+                    path.pop()
+        return [path if agent not in self.failed else None for agent, path in enumerate(paths)]
+
+def position_at(path, t):
+    """Agent position at time t; agents stay at the end of their path"""
+    return path[min(t, len(path) - 1)]
+
+def find_conflicts(paths, agents=None):
+    """Vertex and swap conflicts between planned paths as (t, agent_a, agent_b).
+    
+    Given agents, the (start_pos, goal_pos) pairs passed to the planner,
+    agents that could not be planned count as standing on their start cell.
+    """
+    if agents is not None:
+        paths = [path if path else [start] for path, (start, _) in zip(paths, agents)]
+    planned = [(agent, path) for agent, path in enumerate(paths) if path]
+    makespan = max((len(path) for _, path in planned), default=0)
+    conflicts = []
+    previous = {}
+    for t in range(makespan):
+        occupied = {}
+        for agent, path in planned:
+            here = position_at(path, t)
+            if here in occupied:
+                conflicts.append((t, occupied[here], agent))
+            occupied[here] = agent
+        
+        # A swap is two agents trading cells between t - 1 and t
+        for agent, path in planned:
+            here = position_at(path, t)
+            other = previous.get(here)
+            if t and other is not None and other != agent:
+                before = position_at(path, t - 1)
+                if before != here and position_at(paths[other], t) == before and agent < other:
+                    conflicts.append((t, agent, other))
+        previous = occupied
+    return conflicts
+
+def random_agents(grid, count, rng=None):
+    """Distinct random start and goal cells on open cells of the grid"""
+    rng = rng or random.Random()
+    open_cells = [(cell.row, cell.col) for row in grid.cells for cell in row if not cell.wall]
+    if 2 * count > len(open_cells):
+        raise ValueError(f"Grid has only {len(open_cells)} open cells for {count} agents")
+    chosen = rng.sample(open_cells, 2 * count)
+    return list(zip(chosen[:count], chosen[count:]))
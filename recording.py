@@ -0,0 +1,131 @@
+# recording.py
+
+import struct
+from array import array
+from constants import STATE_VISITED, STATE_FRONTIER, STATE_PATH
+from grid import SolverState
+
+# Event kinds live in the low bits of each event, the cell index in the rest
+EVENT_EXPAND = 0
+EVENT_PUSH = 1
+EVENT_PATH = 2
+EVENT_BITS = 2
+EVENT_MASK = (1 << EVENT_BITS) - 1
+
+RECORDING_MAGIC = b"PFREC1"
+RECORDING_HEADER = struct.Struct("<6sIII")  # magic, rows, cols, event count
+
+class Recording:
+    """Compact stream of solver events (expansions, frontier pushes, path cells)"""
+    
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.events = array('I')
+    
+    def __len__(self):
+        return len(self.events)
+    
+    def clear(self):
+        del self.events[:]
+    
+    def expand(self, index):
+        self.events.append((index << EVENT_BITS) | EVENT_EXPAND)
+    
+    def push(self, index):
+        self.events.append((index << EVENT_BITS) | EVENT_PUSH)
+    
+    def path(self, index):
+        self.events.append((index << EVENT_BITS) | EVENT_PATH)
+    
+    def decode(self, event):
+        """Return (kind, row, col) for an encoded event"""
+        row, col = divmod(event >> EVENT_BITS, self.cols)
+        return event & EVENT_MASK, row, col
+    
+    def save(self, filename):
+        """Write the recording as a small header followed by raw events"""
+        with open(filename, 'wb') as f:
+            f.write(RECORDING_HEADER.pack(RECORDING_MAGIC, self.rows, self.cols, len(self.events)))
+            f.write(self.events.tobytes())
+        return filename
+    
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            magic, rows, cols, count = RECORDING_HEADER.unpack(f.read(RECORDING_HEADER.size))
+            if magic != RECORDING_MAGIC:
+                raise ValueError(f"{filename} is not a pathfinding recording")
+            recording = cls(rows, cols)
+            recording.events.frombytes(f.read(count * recording.events.itemsize))
+        return recording
+
+class Player:
+    """Replays a recording into its own solver state at any speed, forwards or backwards"""
+    
+    def __init__(self, recording, speed=1):
+        self.speed = speed
+        self.state = SolverState(recording.rows, recording.cols)
+        self.undo = bytearray()  # Previous cell state for every applied event
+        self.reset(recording)
+    
+    def reset(self, recording):
+        """Replay another recording from the start, reusing the state buffers"""
+        if (recording.rows, recording.cols) != (self.state.rows, self.state.cols):
+            self.state = SolverState(recording.rows, recording.cols)
+        else:
+            self.state.clear()
+        self.recording = recording
+        self.paused = False
+        self.position = 0  # Number of events applied
+        del self.undo[:]
+    
+    @property
+    def total(self):
+        return len(self.recording)
+    
+    @property
+    def finished(self):
+        return self.position >= self.total
+    
+    def step_forward(self, count=1):
+        events = self.recording.events
+        state = self.state
+        end = min(self.position + count, len(events))
+        for position in range(self.position, end):
+            event = events[position]
+            index = event >> EVENT_BITS
+            kind = event & EVENT_MASK
+            previous = state.value(index)
+            self.undo.append(previous)
+            
+            if kind == EVENT_EXPAND:
+                flags = (previous | STATE_VISITED) & ~STATE_FRONTIER
+            elif kind == EVENT_PUSH:
+                flags = previous | STATE_FRONTIER
+            else:
+                flags = previous | STATE_PATH
+            state.set(index, flags)
+        self.position = end
+    
+    def step_back(self, count=1):
+        events = self.recording.events
+        state = self.state
+        end = max(self.position - count, 0)
+        for position in range(self.position - 1, end - 1, -1):
+            state.set(events[position] >> EVENT_BITS, self.undo.pop())
+        self.position = end
+    
+    def seek(self, step):
+        """Jump to the state after the given number of events"""
+        step = max(0, min(step, self.total))
+        if step > self.position:
+            self.step_forward(step - self.position)
+        elif step < self.position:
+            self.step_back(self.position - step)
+    
+    def update(self):
+        """Advance playback by one frame; returns True once playback is finished"""
+        if not self.paused:
+            self.step_forward(self.speed)
+        return self.finished
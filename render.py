@@ -0,0 +1,82 @@
+# render.py
+
+import os
+import pygame
+from constants import *
+from recording import Player
+
+# Color slots of a rendered cell; the flag priority matches Cell.draw
+SLOT_EMPTY, SLOT_VISITED, SLOT_FRONTIER, SLOT_PATH, SLOT_WALL, SLOT_START, SLOT_GOAL, SLOT_BORDER = range(8)
+# Slot by wall << 3 | solver flags (flags use the low three bits)
+CELL_SLOTS = bytes(SLOT_WALL if code & 8 else
+                   SLOT_PATH if code & STATE_PATH else
+                   SLOT_FRONTIER if code & STATE_FRONTIER else
+                   SLOT_VISITED if code & STATE_VISITED else SLOT_EMPTY
+                   for code in range(16))
+BORDER_COLOR = (220, 220, 220)
+
+def render_grid(grid, state=None, cell_size=RENDER_CELL_SIZE, palette=SOLVER_PALETTES[0]):
+    """Rasterize the grid and one solver state into an RGB array of shape (height, width, 3).
+    
+    Every cell is mapped to a color slot and expanded to cell_size pixels
+    with whole-array operations, so the cost is a few passes over memory
+    instead of one draw call per cell. Needs numpy, imported on first use.
+    """
+    import numpy as np
+    
+    rows, cols = grid.rows, grid.cols
+    codes = np.frombuffer(grid.walls, dtype=np.uint8) << 3
+    if state is not None:
+        # Flags stamped in an earlier epoch read as clear
+        current = np.frombuffer(state.stamps, dtype=np.uint32) == state.epoch
+        codes |= np.where(current, np.frombuffer(state.flags, dtype=np.uint8), 0).astype(np.uint8)
+    slots = np.take(np.frombuffer(CELL_SLOTS, dtype=np.uint8), codes)
+    if grid.start_pos:
+        slots[grid.start_pos[0] * cols + grid.start_pos[1]] = SLOT_START
+    if grid.goal_pos:
+        slots[grid.goal_pos[0] * cols + grid.goal_pos[1]] = SLOT_GOAL
+    slots = slots.reshape(rows, cols)
+    
+    # Colors packed as one uint32 per slot, so every pixel copy moves a single word
+    visited_color, frontier_color, path_color, _ = palette
+    colors = np.zeros((8, 4), dtype=np.uint8)
+    colors[:, :3] = [WHITE, visited_color, frontier_color, path_color, BLACK, RED, YELLOW, BORDER_COLOR]
+    colors = colors.view(np.uint32).ravel()
+    
+    # One block of cell_size x cell_size pixels per cell
+    cells = np.take(colors, slots)
+    pixels = np.repeat(np.repeat(cells, cell_size, axis=0), cell_size, axis=1)
+    if cell_size >= 4:
+        # Light outline around empty cells, like the live view
+        borders = np.take(colors, np.where(slots == SLOT_EMPTY, SLOT_BORDER, slots))
+        blocks = pixels.reshape(rows, cell_size, cols, cell_size)
+        for edge in (0, cell_size - 1):
+            blocks[:, edge, :, :] = borders[:, :, None]
+            blocks[:, :, :, edge] = borders[:, None, :]
+    return pixels.view(np.uint8).reshape(rows * cell_size, cols * cell_size, 4)[:, :, :3]
+
+def save_png(image, filename):
+    """Write an RGB array from render_grid as a PNG"""
+    surface = pygame.surfarray.make_surface(image.swapaxes(0, 1))
+    pygame.image.save(surface, filename)
+    return filename
+
+def render_exploration(grid, recording, frames=RENDER_FRAMES, cell_size=RENDER_CELL_SIZE, palette=SOLVER_PALETTES[0]):
+    """Yield frames + 1 images of a recorded search, evenly spaced from start to finish"""
+    player = Player(recording)
+    for frame in range(frames + 1):
+        player.seek(player.total * frame // frames)
+        yield render_grid(grid, player.state, cell_size, palette)
+
+def save_frames(images, directory, prefix="frame"):
+    """Write a PNG sequence into directory; returns the filenames"""
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    return [save_png(image, os.path.join(directory, f"{prefix}_{i:04d}.png")) for i, image in enumerate(images)]
+
+def save_gif(images, filename, fps=RENDER_FPS):
+    """Write an animated GIF; Pillow is imported only when a GIF is written"""
+    from PIL import Image
+    frames = [Image.fromarray(image) for image in images]
+    frames[0].save(filename, save_all=True, append_images=frames[1:], duration=1000 // fps, loop=0)
+    return filename
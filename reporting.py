@@ -0,0 +1,256 @@
+# reporting.py
+
+import csv
+import json
+import os
+import sys
+import time
+from constants import REPORTS_DIR, RUN_LOG_PATH
+
+# Columns of a run record, in CSV order
+RUN_FIELDS = [
+    'timestamp', 'algorithm', 'grid_hash', 'rows', 'cols', 'start', 'goal',
+    'found', 'time', 'nodes_explored', 'path_length', 'peak_memory'
+]
+
+def make_run_record(algorithm, algorithm_name=None):
+    """Build a flat run record from a finished algorithm"""
+    grid = algorithm.grid
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'algorithm': algorithm_name or type(algorithm).__name__,
+        'grid_hash': grid.layout_hash(),
+        'rows': grid.rows,
+        'cols': grid.cols,
+        'start': list(grid.start_pos) if grid.start_pos else None,
+        'goal': list(grid.goal_pos) if grid.goal_pos else None,
+        'found': algorithm.found,
+        'time': round(algorithm.elapsed, 6),
+        'nodes_explored': algorithm.nodes_explored,
+        'path_length': algorithm.path_length,
+        'peak_memory': algorithm.peak_memory
+    }
+
+class RunLog:
+    """Append-only log of run records (JSON lines, or CSV for a .csv path)"""
+    
+    def __init__(self, path=RUN_LOG_PATH):
+        self.path = path
+        self.is_csv = path.endswith('.csv')
+    
+    def append(self, record):
+        """Append one run record to the log"""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        if self.is_csv:
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            # Keep appending in the columns of an existing log, even an older one
+            fields = RUN_FIELDS if write_header else self._csv_header()
+            with open(self.path, 'a', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                if write_header:
+                    writer.writeheader()
+                writer.writerow({key: self._csv_value(record.get(key)) for key in fields})
+        else:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+    
+    def _csv_header(self):
+        with open(self.path, newline='') as f:
+            return next(csv.reader(f))
+    
+    def _csv_value(self, value):
+        if isinstance(value, list):
+            return "x".join(str(v) for v in value)
+        return value
+    
+    def read(self):
+        """Read all run records from the log"""
+        if not os.path.exists(self.path):
+            return []
+        
+        records = []
+        with open(self.path, newline='') as f:
+            if self.is_csv:
+                for row in csv.DictReader(f):
+                    row['found'] = row['found'] == 'True'
+                    for key in ('rows', 'cols', 'nodes_explored', 'path_length'):
+                        row[key] = int(row[key])
+                    row['time'] = float(row['time'])
+                    # Empty when memory was not measured or in logs written before the column
+                    row['peak_memory'] = int(row['peak_memory']) if row.get('peak_memory') else None
+                    records.append(row)
+            else:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        records.append(json.loads(line))
+        return records
+    
+    def summarize(self, records=None):
+        """Aggregate run records per algorithm"""
+        if records is None:
+            records = self.read()
+        
+        groups = {}
+        for record in records:
+            groups.setdefault(record['algorithm'], []).append(record)
+        
+        summary = []
+        for name, runs in sorted(groups.items()):
+            times = [run['time'] for run in runs]
+            found = [run for run in runs if run['found']]
+            peaks = [run['peak_memory'] for run in runs if run.get('peak_memory') is not None]
+            summary.append({
+                'algorithm': name,
+                'runs': len(runs),
+                'grids': len({run['grid_hash'] for run in runs}),
+                'found': len(found),
+                'mean_time': sum(times) / len(times),
+                'min_time': min(times),
+                'max_time': max(times),
+                'mean_nodes_explored': sum(run['nodes_explored'] for run in runs) / len(runs),
+                'mean_path_length': sum(run['path_length'] for run in found) / len(found) if found else 0,
+                'mean_peak_memory': sum(peaks) / len(peaks) if peaks else None
+            })
+        return summary
+    
+    def write_summary_report(self, backend="text"):
+        """Write an aggregated report of every logged run; returns the filename"""
+        summary = self.summarize()
+        if backend == "pdf":
+            return PDFReportBackend().write_summary_report(summary)
+        
+        if not os.path.exists(REPORTS_DIR):
+            os.makedirs(REPORTS_DIR)
+        
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        filename = f"{REPORTS_DIR}/summary_{timestamp}.txt"
+        with open(filename, 'w') as f:
+            f.write(f"Pathfinding Run Summary ({self.path})\n\n")
+            for line in format_summary(summary):
+                f.write(line + "\n")
+        return filename
+
+def format_summary(summary):
+    """Format summary rows as fixed-width text lines"""
+    lines = [f"{'Algorithm':<12}{'Runs':>6}{'Grids':>7}{'Found':>7}{'Mean s':>10}"
+             f"{'Min s':>10}{'Max s':>10}{'Peak KB':>10}{'Nodes':>10}{'Path':>8}"]
+    for row in summary:
+        peak = row.get('mean_peak_memory')
+        peak = f"{peak / 1024:>10.1f}" if peak is not None else f"{'-':>10}"
+        lines.append(f"{row['algorithm']:<12}{row['runs']:>6}{row['grids']:>7}{row['found']:>7}"
+                     f"{row['mean_time']:>10.4f}{row['min_time']:>10.4f}{row['max_time']:>10.4f}{peak}"
+                     f"{row['mean_nodes_explored']:>10.1f}{row['mean_path_length']:>8.1f}")
+    return lines
+
+class PDFReportBackend:
+    """PDF report writer; fpdf is imported only when a report is written"""
+    
+    def _new_pdf(self):
+        from fpdf import FPDF
+        pdf = FPDF()
+        pdf.add_page()
+        return pdf
+    
+    def _filename(self, prefix):
+        if not os.path.exists(REPORTS_DIR):
+            os.makedirs(REPORTS_DIR)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        return f"{REPORTS_DIR}/{prefix}_{timestamp}.pdf"
+    
+    def write_run_report(self, algorithm, algorithm_name):
+        """Generate PDF report with algorithm steps and results"""
+        pdf = self._new_pdf()
+        filename = self._filename(f"{algorithm_name}_report")
+        
+        # Title
+        pdf.set_font('Arial', 'B', 16)
+        pdf.cell(0, 10, f'{algorithm_name} Pathfinding Report', 0, 1, 'C')
+        pdf.ln(10)
+        
+        # Results summary
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 10, 'Results Summary:', 0, 1)
+        pdf.set_font('Arial', '', 12)
+        
+        result_text = "Path Found: Yes" if algorithm.found else "Path Found: No"
+        pdf.cell(0, 10, result_text, 0, 1)
+        pdf.cell(0, 10, f"Total Time: {algorithm.elapsed:.4f} seconds", 0, 1)
+        pdf.cell(0, 10, f"Nodes Explored: {algorithm.nodes_explored}", 0, 1)
+        pdf.cell(0, 10, f"Path Length: {algorithm.path_length}", 0, 1)
+        if algorithm.peak_memory is not None:
+            pdf.cell(0, 10, f"Peak Memory: {algorithm.peak_memory / 1024:.1f} KB", 0, 1)
+        pdf.ln(10)
+        
+        # Algorithm steps
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 10, 'Algorithm Steps:', 0, 1)
+        pdf.set_font('Arial', '', 10)
+        
+        steps = algorithm.steps
+        for i, step in enumerate(steps[:50]):  # Limit to first 50 steps
+            node_str = f" at {step['node']}" if step['node'] else ""
+            pdf.cell(0, 8, f"Step {i+1}: {step['description']}{node_str} (Time: {step['timestamp']:.2f}s, Nodes: {step['nodes_explored']})", 0, 1)
+        
+        if algorithm.step_count > 50:
+            pdf.cell(0, 8, f"... and {algorithm.step_count - 50} more steps", 0, 1)
+        
+        pdf.ln(10)
+        
+        # Grid information
+        grid = algorithm.grid
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 10, 'Grid Information:', 0, 1)
+        pdf.set_font('Arial', '', 12)
+        pdf.cell(0, 10, f"Grid Size: {grid.rows} x {grid.cols}", 0, 1)
+        pdf.cell(0, 10, f"Start Position: {grid.start_pos}", 0, 1)
+        pdf.cell(0, 10, f"Goal Position: {grid.goal_pos}", 0, 1)
+        
+        # Rendered grid with the explored cells and path, when numpy is available
+        image_filename = self._grid_image(algorithm, filename.replace('.pdf', '.png'))
+        if image_filename:
+            pdf.add_page()
+            pdf.set_font('Arial', 'B', 12)
+            pdf.cell(0, 10, 'Final Search State:', 0, 1)
+            # Fit inside the A4 text area, keeping the grid's aspect ratio
+            width = min(190, 250 * grid.cols / grid.rows)
+            pdf.image(image_filename, w=width, h=width * grid.rows / grid.cols)
+        
+        pdf.output(filename)
+        return filename
+    
+    def _grid_image(self, algorithm, filename):
+        from render import render_grid, save_png
+        grid = algorithm.grid
+        try:
+            image = render_grid(grid, algorithm.state, max(1, min(8, 1600 // max(grid.rows, grid.cols))))
+        except ImportError:
+            return None
+        return save_png(image, filename)
+    
+    def write_summary_report(self, summary):
+        """Generate a PDF table aggregating many runs"""
+        pdf = self._new_pdf()
+        filename = self._filename("summary")
+        
+        pdf.set_font('Arial', 'B', 16)
+        pdf.cell(0, 10, 'Pathfinding Run Summary', 0, 1, 'C')
+        pdf.ln(10)
+        
+        pdf.set_font('Courier', '', 9)
+        for line in format_summary(summary):
+            pdf.cell(0, 6, line, 0, 1)
+        
+        pdf.output(filename)
+        return filename
+
+if __name__ == "__main__":
+    # Usage: python reporting.py [run_log_path] [--pdf]
+    args = [arg for arg in sys.argv[1:] if arg != "--pdf"]
+    log = RunLog(args[0] if args else RUN_LOG_PATH)
+    for line in format_summary(log.summarize()):
+        print(line)
+    print(f"Summary report written: {log.write_summary_report('pdf' if '--pdf' in sys.argv else 'text')}")
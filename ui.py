@@ -2,7 +2,38 @@
 
 import pygame
 import time
+import os
 from constants import *
+from recording import Player
+from worker import SearchWorker
+from render import render_grid, render_exploration, save_png, save_frames, save_gif
+from multiagent import CooperativePlanner, random_agents
+
+# Font and text caches shared by every widget. SysFont lookups scan the
+# system font list, so each (size, bold) font is created once and reused.
+_font_cache = {}
+_text_cache = {}
+TEXT_CACHE_LIMIT = 256
+
+def get_font(size, bold=False):
+    """Return a cached Arial font of the given size"""
+    key = (size, bold)
+    font = _font_cache.get(key)
+    if font is None:
+        font = pygame.font.SysFont('Arial', size, bold=bold)
+        _font_cache[key] = font
+    return font
+
+def render_text(text, size, color, bold=False):
+    """Return a cached surface with text rendered in the given font"""
+    key = (text, size, bold, tuple(color))
+    surface = _text_cache.get(key)
+    if surface is None:
+        if len(_text_cache) >= TEXT_CACHE_LIMIT:
+            _text_cache.clear()
+        surface = get_font(size, bold).render(text, True, color)
+        _text_cache[key] = surface
+    return surface
 
 class Button:
     def __init__(self, x, y, width, height, text, color=BUTTON_COLOR, hover_color=BUTTON_HOVER, 
@@ -15,7 +46,6 @@ class Button:
         self.text_color = text_color
         self.is_hovered = False
         self.is_active = False
-        self.font = pygame.font.SysFont('Arial', 14, bold=True)
         self.icon = icon
     
     def draw(self, screen):
@@ -35,7 +65,7 @@ class Button:
         pygame.draw.rect(screen, (255, 255, 255, 50), highlight_rect, border_radius=8)
         
         # Draw text
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = render_text(self.text, 14, self.text_color, bold=True)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
         
@@ -70,8 +100,7 @@ class Section:
         pygame.draw.rect(screen, (60, 60, 70), section_bg, border_radius=10)
         
         # Draw section title
-        font = pygame.font.SysFont('Arial', 16, bold=True)
-        title_surface = font.render(self.title, True, LIGHT_BLUE)
+        title_surface = render_text(self.title, 16, LIGHT_BLUE, bold=True)
         screen.blit(title_surface, (self.rect.x, self.rect.y - 5))
         
         # Draw buttons
@@ -99,8 +128,7 @@ class Message:
     
     def draw(self, screen):
         if self.visible:
-            font = pygame.font.SysFont('Arial', 14, bold=True)
-            text_surface = font.render(self.text, True, self.color)
+            text_surface = render_text(self.text, 14, self.color, bold=True)
             
             # Draw background for message
             text_rect = text_surface.get_rect(center=(WINDOW_WIDTH // 2, UI_HEIGHT // 2))
@@ -116,7 +144,20 @@ class UI:
         self.mode = "draw"
         self.algorithm_running = False
         self.current_algorithm = None
+        self.solvers = []
+        self.players = []
+        self.replay_pool = []  # One reusable player per solver slot
+        self.worker = None
+        self.view = "split"
+        self.agent_paths = []
+        self.agent_frame = 0
         self.message = Message()
+        self.static_surface = None
+        self.static_key = None
+        # The status line changes almost every frame, so it is rendered
+        # outside the shared text cache and kept only until it changes
+        self.status_text = ""
+        self.status_surface = None
         self.create_ui()
     
     def create_ui(self):
@@ -155,7 +196,9 @@ class UI:
         algo_buttons = [
             Button(sidebar_x + 20, 90 + 3*(BUTTON_HEIGHT + BUTTON_MARGIN) + 50 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN) + 70, BUTTON_WIDTH, BUTTON_HEIGHT, "Run Breadth-First Search (BFS)", (150, 200, 255), (170, 220, 255), (190, 240, 255)),
             Button(sidebar_x + 20, 90 + 3*(BUTTON_HEIGHT + BUTTON_MARGIN) + 50 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN) + 70 + BUTTON_HEIGHT + BUTTON_MARGIN, BUTTON_WIDTH, BUTTON_HEIGHT, "Run A* Algorithm", (200, 150, 255), (220, 170, 255), (240, 190, 255)),
-            Button(sidebar_x + 20, 90 + 3*(BUTTON_HEIGHT + BUTTON_MARGIN) + 50 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN) + 70 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN), BUTTON_WIDTH, BUTTON_HEIGHT, "Reset Visualization", (150, 150, 150), (170, 170, 170), (190, 190, 190))
+            Button(sidebar_x + 20, 90 + 3*(BUTTON_HEIGHT + BUTTON_MARGIN) + 50 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN) + 70 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN), BUTTON_WIDTH, BUTTON_HEIGHT, "Race BFS vs A*", (255, 200, 150), (255, 215, 170), (255, 230, 190)),
+            Button(sidebar_x + 20, 90 + 3*(BUTTON_HEIGHT + BUTTON_MARGIN) + 50 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN) + 70 + 3*(BUTTON_HEIGHT + BUTTON_MARGIN), BUTTON_WIDTH, BUTTON_HEIGHT, "Plan Multi-Agent Paths", (150, 230, 200), (170, 240, 215), (190, 250, 230)),
+            Button(sidebar_x + 20, 90 + 3*(BUTTON_HEIGHT + BUTTON_MARGIN) + 50 + 2*(BUTTON_HEIGHT + BUTTON_MARGIN) + 70 + 4*(BUTTON_HEIGHT + BUTTON_MARGIN), BUTTON_WIDTH, BUTTON_HEIGHT, "Reset Visualization", (150, 150, 150), (170, 170, 170), (190, 190, 190))
         ]
         
         for button in algo_buttons:
@@ -167,67 +210,100 @@ class UI:
         setup_buttons[2].is_active = True
     
     def draw(self, screen):
+        # Re-render the static sidebar and top bar only when their content changed
+        state_key = self.get_state_key()
+        if self.static_surface is None or state_key != self.static_key:
+            self.render_static()
+            self.static_key = state_key
+        
+        top_bar = pygame.Rect(0, 0, WINDOW_WIDTH - SIDEBAR_WIDTH, UI_HEIGHT)
+        sidebar_rect = pygame.Rect(WINDOW_WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT)
+        screen.blit(self.static_surface, top_bar, top_bar)
+        screen.blit(self.static_surface, sidebar_rect, sidebar_rect)
+        
+        # The running status overlaps the grid edge, so it is blitted on top every frame
+        status_text = self.get_status_text()
+        if status_text:
+            if status_text != self.status_text:
+                self.status_text = status_text
+                self.status_surface = get_font(14).render(status_text, True, GREEN)
+            screen.blit(self.status_surface, (WINDOW_WIDTH - SIDEBAR_WIDTH - 200, 35))
+        
+        # Draw message
+        self.message.draw(screen)
+    
+    def get_status_text(self):
+        if self.algorithm_running and self.players:
+            player = max(self.players, key=lambda p: p.total)
+            paused = " (paused)" if player.paused else ""
+            return f"Replay: {player.position}/{player.total} x{player.speed}{paused}"
+        snapshot = self.worker.latest() if self.worker else None
+        if self.algorithm_running and snapshot:
+            paused = " (paused)" if self.worker.paused else ""
+            return f"Searching: {sum(snapshot.nodes_explored)} nodes{paused}"
+        if self.algorithm_running:
+            return f"Running: {type(self.current_algorithm).__name__}"
+        return ""
+    
+    def get_state_key(self):
+        """Everything the static UI surface depends on"""
+        button_states = tuple((button.is_hovered, button.is_active)
+                              for section in self.sections for button in section.buttons)
+        mode_text = f"Mode: {self.mode.replace('_', ' ').title()}"
+        return button_states, mode_text
+    
+    def render_static(self):
+        """Render sidebar, top bar, sections and legend to the offscreen surface"""
+        if self.static_surface is None:
+            self.static_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        surface = self.static_surface
+        
         # Draw sidebar background with gradient
         sidebar_rect = pygame.Rect(WINDOW_WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT)
-        pygame.draw.rect(screen, SIDEBAR_COLOR, sidebar_rect)
+        pygame.draw.rect(surface, SIDEBAR_COLOR, sidebar_rect)
         
         # Add subtle pattern to sidebar
         for i in range(0, SIDEBAR_WIDTH, 4):
-            pygame.draw.line(screen, (60, 60, 70), 
+            pygame.draw.line(surface, (60, 60, 70), 
                            (WINDOW_WIDTH - SIDEBAR_WIDTH + i, 0),
                            (WINDOW_WIDTH - SIDEBAR_WIDTH + i, WINDOW_HEIGHT), 1)
         
         # Draw top bar
         top_bar = pygame.Rect(0, 0, WINDOW_WIDTH - SIDEBAR_WIDTH, UI_HEIGHT)
-        pygame.draw.rect(screen, (40, 40, 50), top_bar)
+        pygame.draw.rect(surface, (40, 40, 50), top_bar)
         
         # Draw app title
-        title_font = pygame.font.SysFont('Arial', 24, bold=True)
-        title_surface = title_font.render("Pathfinding AI Visualizer", True, LIGHT_BLUE)
-        screen.blit(title_surface, (20, 10))
-        
-        # Draw current status
-        status_font = pygame.font.SysFont('Arial', 14)
+        title_surface = render_text("Pathfinding AI Visualizer", 24, LIGHT_BLUE, bold=True)
+        surface.blit(title_surface, (20, 10))
         
+        # Draw current mode
         mode_text = f"Mode: {self.mode.replace('_', ' ').title()}"
-        mode_surface = status_font.render(mode_text, True, WHITE)
-        screen.blit(mode_surface, (WINDOW_WIDTH - SIDEBAR_WIDTH - 200, 15))
-        
-        if self.algorithm_running:
-            status_text = f"Running: {type(self.current_algorithm).__name__}"
-            status_surface = status_font.render(status_text, True, GREEN)
-            screen.blit(status_surface, (WINDOW_WIDTH - SIDEBAR_WIDTH - 200, 35))
+        mode_surface = render_text(mode_text, 14, WHITE)
+        surface.blit(mode_surface, (WINDOW_WIDTH - SIDEBAR_WIDTH - 200, 15))
         
         # Draw instructions in top bar
-        instruction_font = pygame.font.SysFont('Arial', 12)
         instructions = [
             "Left-click: Draw Walls | Right-click: Erase Walls",
-            "Set Start & Goal positions, then run an algorithm"
+            "Set Start & Goal, then run | Space: Pause | Esc: Cancel | Replay: Arrows, 0-9, V, S, P, G"
         ]
         
         for i, instruction in enumerate(instructions):
-            instr_surface = instruction_font.render(instruction, True, LIGHT_GRAY)
-            screen.blit(instr_surface, (250, 10 + i * 15))
+            instr_surface = render_text(instruction, 12, LIGHT_GRAY)
+            surface.blit(instr_surface, (250, 10 + i * 15))
         
         # Draw sections
         for section in self.sections:
-            section.draw(screen)
+            section.draw(surface)
         
         # Draw legend in sidebar bottom
-        self.draw_legend(screen)
-        
-        # Draw message
-        self.message.draw(screen)
+        self.draw_legend(surface)
     
     def draw_legend(self, screen):
         legend_y = WINDOW_HEIGHT - 180
         legend_x = WINDOW_WIDTH - SIDEBAR_WIDTH + 20
         
-        legend_font = pygame.font.SysFont('Arial', 14, bold=True)
-        item_font = pygame.font.SysFont('Arial', 12)
-        
         # Legend title
-        title_surface = legend_font.render("LEGEND", True, LIGHT_BLUE)
+        title_surface = render_text("LEGEND", 14, LIGHT_BLUE, bold=True)
         screen.blit(title_surface, (legend_x, legend_y))
         
         legend_items = [
@@ -245,7 +321,7 @@ class UI:
             pygame.draw.rect(screen, WHITE, (legend_x, legend_y + 30 + i * 25, 15, 15), 1)
             
             # Text
-            text_surface = item_font.render(text, True, WHITE)
+            text_surface = render_text(text, 12, WHITE)
             screen.blit(text_surface, (legend_x + 25, legend_y + 30 + i * 25))
     
     def handle_event(self, event, grid, algorithms):
@@ -285,14 +361,22 @@ class UI:
         
         # Handle Maze Generation
         elif button_text == "Generate Random Maze":
+            self.stop_search()
             grid.generate_maze_prim()
             self.algorithm_running = False
             self.current_algorithm = None
+            self.solvers = []
+            self.players = []
+            self.agent_paths = []
             self.message.show("Random maze generated!", GREEN)
         elif button_text == "Clear Entire Grid":
+            self.stop_search()
             grid.clear_grid()
             self.algorithm_running = False
             self.current_algorithm = None
+            self.solvers = []
+            self.players = []
+            self.agent_paths = []
             self.message.show("Grid cleared!", ORANGE)
         
         # Handle Algorithms
@@ -302,29 +386,219 @@ class UI:
             elif not grid.goal_pos:
                 self.message.show("Error: Please set a goal position first!", RED)
             else:
-                self.current_algorithm = algorithms["BFS"]
-                if self.current_algorithm.start():
-                    self.algorithm_running = True
-                    self.update_algorithm_buttons(button_text)
-                    self.message.show("BFS algorithm started...", BLUE)
+                self.start_run([algorithms["BFS"]], button_text)
+                self.message.show("BFS algorithm started...", BLUE)
         elif button_text == "Run A* Algorithm":
             if not grid.start_pos:
                 self.message.show("Error: Please set a start position first!", RED)
             elif not grid.goal_pos:
                 self.message.show("Error: Please set a goal position first!", RED)
             else:
-                self.current_algorithm = algorithms["A*"]
-                if self.current_algorithm.start():
-                    self.algorithm_running = True
-                    self.update_algorithm_buttons(button_text)
-                    self.message.show("A* algorithm started...", BLUE)
+                self.start_run([algorithms["A*"]], button_text)
+                self.message.show("A* algorithm started...", BLUE)
+        elif button_text == "Race BFS vs A*":
+            if not grid.start_pos:
+                self.message.show("Error: Please set a start position first!", RED)
+            elif not grid.goal_pos:
+                self.message.show("Error: Please set a goal position first!", RED)
+            else:
+                self.start_run([algorithms["BFS"], algorithms["A*"]], button_text)
+                self.message.show("Racing BFS and A*...", BLUE)
+        elif button_text == "Plan Multi-Agent Paths":
+            self.plan_agents(grid)
         elif button_text == "Reset Visualization":
-            grid.reset_algorithm()
+            self.stop_search()
+            grid.reset_algorithm(self.visible_states())
             self.algorithm_running = False
             self.current_algorithm = None
+            self.solvers = []
+            self.players = []
+            self.agent_paths = []
             self.clear_algorithm_buttons()
             self.message.show("Visualization reset!", LIGHT_BLUE)
     
+    def plan_agents(self, grid):
+        """Plan collision-free paths for random agents on the current grid"""
+        try:
+            agents = random_agents(grid, MULTI_AGENT_COUNT)
+        except ValueError as e:
+            self.message.show(str(e), RED)
+            return
+        
+        self.stop_search()
+        planner = CooperativePlanner(grid, window=MULTI_AGENT_WINDOW)
+        self.agent_paths = planner.plan(agents)
+        self.agent_frame = 0
+        self.algorithm_running = False
+        self.solvers = []
+        self.players = []
+        self.message.show(f"Planned {len(agents) - len(planner.failed)}/{len(agents)} agents "
+                          f"in {planner.planning_time * 1000:.0f} ms", GREEN, 5000)
+    
+    def update_agents(self):
+        """Advance the multi-agent animation by one frame"""
+        if self.agent_paths:
+            self.agent_frame += 1
+    
+    def agent_time(self):
+        return self.agent_frame // AGENT_STEP_FRAMES
+    
+    def start_run(self, solvers, button_text):
+        """Queue one solver, or several racing solvers, for the main loop"""
+        self.stop_search()
+        self.current_algorithm = solvers[0]
+        self.solvers = solvers
+        self.players = []
+        self.agent_paths = []
+        self.algorithm_running = True
+        self.update_algorithm_buttons(button_text)
+    
+    def start_search(self):
+        """Run the queued solvers in a background worker"""
+        self.worker = SearchWorker(self.solvers)
+        self.worker.start()
+    
+    def stop_search(self):
+        """Cancel a running search; its solvers are left half-finished and discarded"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+    
+    def searching(self):
+        return self.worker is not None and not self.worker.done()
+    
+    def start_playback(self):
+        """Replay the recordings of the solved run, one player per solver.
+        
+        Players are kept between runs and reset, so a new run starts a new
+        epoch of their state buffers instead of allocating fresh ones.
+        """
+        self.worker = None
+        for slot, solver in enumerate(self.solvers):
+            if slot < len(self.replay_pool):
+                self.replay_pool[slot].reset(solver.recording)
+                self.replay_pool[slot].speed = PLAYBACK_SPEED
+            else:
+                self.replay_pool.append(Player(solver.recording, PLAYBACK_SPEED))
+        self.players = self.replay_pool[:len(self.solvers)]
+    
+    def visible_states(self):
+        """Solver states the grid should composite this frame"""
+        if self.players:
+            return [player.state for player in self.players]
+        snapshot = self.worker.latest() if self.worker else None
+        return snapshot.states if snapshot else []
+    
+    def handle_search_key(self, event):
+        """Pause, resume or cancel a search that is still running"""
+        if event.key == pygame.K_SPACE:
+            if self.worker.paused:
+                self.worker.resume()
+            else:
+                self.worker.pause()
+            return True
+        if event.key == pygame.K_ESCAPE:
+            self.stop_search()
+            self.algorithm_running = False
+            self.current_algorithm = None
+            self.solvers = []
+            self.clear_algorithm_buttons()
+            self.message.show("Search cancelled", ORANGE)
+            return True
+        return False
+    
+    def handle_key(self, event, grid):
+        """Playback controls: pause, scrub, jump, speed, view, save and export"""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if self.searching():
+            return self.handle_search_key(event)
+        if not self.players:
+            return False
+        
+        if event.key == pygame.K_v:
+            self.view = "overlay" if self.view == "split" else "split"
+            return True
+        
+        if event.key == pygame.K_s:
+            filenames = self.save_recordings()
+            self.message.show(f"Recording saved: {', '.join(filenames)}", LIGHT_BLUE, 5000)
+            return True
+        
+        if event.key in (pygame.K_p, pygame.K_g):
+            try:
+                filenames = self.export_images(grid) if event.key == pygame.K_p else self.export_animations(grid)
+                self.message.show(f"Exported: {', '.join(filenames)}", LIGHT_BLUE, 5000)
+            except ImportError:
+                self.message.show("Image export needs numpy (and Pillow for GIFs)", RED)
+            return True
+        
+        for player in self.players:
+            if event.key == pygame.K_SPACE:
+                player.paused = not player.paused
+            elif event.key == pygame.K_RIGHT:
+                player.paused = True
+                player.step_forward(player.speed)
+            elif event.key == pygame.K_LEFT:
+                player.paused = True
+                player.step_back(player.speed)
+            elif event.key == pygame.K_HOME:
+                player.seek(0)
+            elif event.key == pygame.K_END:
+                player.seek(player.total)
+            elif event.key == pygame.K_UP:
+                player.speed = min(player.speed * 2, MAX_PLAYBACK_SPEED)
+            elif event.key == pygame.K_DOWN:
+                player.speed = max(player.speed // 2, 1)
+            elif pygame.K_0 <= event.key <= pygame.K_9:
+                # Jump to 0%, 10%, ... 90% of the recording
+                player.seek(player.total * (event.key - pygame.K_0) // 10)
+            else:
+                return False
+        return True
+    
+    def save_recordings(self):
+        """Save the current recordings next to the reports"""
+        if not os.path.exists(REPORTS_DIR):
+            os.makedirs(REPORTS_DIR)
+        
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        filenames = []
+        for solver, player in zip(self.solvers, self.players):
+            algorithm_name = type(solver).__name__
+            filenames.append(player.recording.save(f"{REPORTS_DIR}/{algorithm_name}_recording_{timestamp}.rec"))
+        return filenames
+    
+    def export_images(self, grid):
+        """Save a PNG of every replay at its current position"""
+        if not os.path.exists(REPORTS_DIR):
+            os.makedirs(REPORTS_DIR)
+        
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        filenames = []
+        for i, (solver, player) in enumerate(zip(self.solvers, self.players)):
+            image = render_grid(grid, player.state, palette=SOLVER_PALETTES[i % len(SOLVER_PALETTES)])
+            filenames.append(save_png(image, f"{REPORTS_DIR}/{type(solver).__name__}_{timestamp}.png"))
+        return filenames
+    
+    def export_animations(self, grid):
+        """Save every recording as a GIF, or as a PNG sequence without Pillow"""
+        if not os.path.exists(REPORTS_DIR):
+            os.makedirs(REPORTS_DIR)
+        
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        filenames = []
+        for i, solver in enumerate(self.solvers):
+            name = f"{REPORTS_DIR}/{type(solver).__name__}_{timestamp}"
+            palette = SOLVER_PALETTES[i % len(SOLVER_PALETTES)]
+            images = render_exploration(grid, solver.recording, palette=palette)
+            try:
+                filenames.append(save_gif(list(images), f"{name}.gif"))
+            except ImportError:
+                save_frames(render_exploration(grid, solver.recording, palette=palette), name)
+                filenames.append(f"{name}/")
+        return filenames
+    
     def update_mode_buttons(self, active_button_text):
         """Update active state for mode buttons"""
         for section in self.sections:
@@ -336,14 +610,14 @@ class UI:
         """Update active state for algorithm buttons"""
         for section in self.sections:
             for button in section.buttons:
-                if button.text in ["Run Breadth-First Search (BFS)", "Run A* Algorithm"]:
+                if button.text in ["Run Breadth-First Search (BFS)", "Run A* Algorithm", "Race BFS vs A*"]:
                     button.is_active = (button.text == active_button_text)
     
     def clear_algorithm_buttons(self):
         """Clear active state from algorithm buttons"""
         for section in self.sections:
             for button in section.buttons:
-                if button.text in ["Run Breadth-First Search (BFS)", "Run A* Algorithm"]:
+                if button.text in ["Run Breadth-First Search (BFS)", "Run A* Algorithm", "Race BFS vs A*"]:
                     button.is_active = False
     
     def handle_grid_click(self, event, grid):
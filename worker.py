@@ -0,0 +1,104 @@
+# worker.py
+
+import threading
+import time
+from constants import SNAPSHOT_INTERVAL, WORKER_BATCH
+
+class Snapshot:
+    """Copy of the solvers' progress at one point of a search; never changes once published"""
+    
+    def __init__(self, version, states, nodes_explored, done):
+        self.version = version
+        self.states = states
+        self.nodes_explored = nodes_explored
+        self.done = done
+
+class SearchWorker:
+    """Steps solvers in a background thread and publishes versioned snapshots.
+    
+    The worker owns the solvers until the search is done; the render loop
+    only reads latest(). Racing solvers are stepped round-robin in batches
+    of WORKER_BATCH steps, and a snapshot of their state flags is published
+    at most every SNAPSHOT_INTERVAL seconds, plus once when the search ends.
+    Each solver's elapsed time counts only its own steps, so pauses and the
+    other racing solvers' batches do not inflate the logged run time.
+    """
+    
+    def __init__(self, solvers):
+        self.solvers = solvers
+        self.version = 0
+        self.snapshot = None
+        self.running = threading.Event()
+        self.running.set()
+        self.cancelled = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def run(self):
+        active = []
+        for solver in self.solvers:
+            begin = time.perf_counter()
+            started = solver.start()
+            solver.elapsed += time.perf_counter() - begin
+            if started:
+                active.append(solver)
+        last_publish = time.perf_counter()
+        
+        while active and not self.cancelled.is_set():
+            if not self.running.is_set():
+                # Paused: show exactly where the search stopped, then wait
+                self.publish()
+                self.running.wait()
+                continue
+            
+            for solver in list(active):
+                begin = time.perf_counter()
+                for _ in range(WORKER_BATCH):
+                    if solver.run_step():
+                        solver.end_time = time.time()
+                        active.remove(solver)
+                        break
+                solver.elapsed += time.perf_counter() - begin
+            
+            now = time.perf_counter()
+            if now - last_publish >= SNAPSHOT_INTERVAL:
+                self.publish()
+                last_publish = now
+        
+        self.publish(done=True)
+    
+    def publish(self, done=False):
+        """Copy the solvers' current state into a new snapshot"""
+        states = [solver.state.copy() for solver in self.solvers]
+        nodes_explored = [solver.nodes_explored for solver in self.solvers]
+        # Replacing the reference is atomic, so readers see either snapshot whole
+        self.snapshot = Snapshot(self.version + 1, states, nodes_explored, done)
+        self.version += 1
+    
+    def latest(self):
+        """Most recently published snapshot, or None before the first one"""
+        return self.snapshot
+    
+    @property
+    def paused(self):
+        return not self.running.is_set()
+    
+    def pause(self):
+        self.running.clear()
+    
+    def resume(self):
+        self.running.set()
+    
+    def cancel(self):
+        """Stop the search after the current batch and wait for the thread to exit"""
+        self.cancelled.set()
+        self.running.set()
+        if self.thread is not None:
+            self.thread.join()
+    
+    def done(self):
+        snapshot = self.snapshot
+        return snapshot is not None and snapshot.done